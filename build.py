@@ -4,6 +4,7 @@ Build script for PastePal
 
 import os
 import sys
+import hashlib
 import shutil
 import subprocess
 from pathlib import Path
@@ -45,45 +46,115 @@ def run_command(command, description):
         return False
 
 
+def _fast_rmtree(path):
+    """Remove a large directory tree using the platform's native tool"""
+    if sys.platform == 'win32':
+        command = ['cmd', '/c', 'rmdir', '/S', '/Q', path]
+    else:
+        command = ['rm', '-rf', path]
+    
+    try:
+        subprocess.run(command, check=False, capture_output=True)
+    except OSError:
+        pass
+    
+    # Fall back to shutil if the native tool failed or is unavailable
+    if os.path.exists(path):
+        shutil.rmtree(path, ignore_errors=True)
+
+
 def clean_build_directories():
     """Clean previous build directories"""
     print("Cleaning build directories...")
     
+    # Only the large output trees are worth a native tool's process startup
     dirs_to_clean = ['build', 'dist', '__pycache__']
     for dir_name in dirs_to_clean:
         if os.path.exists(dir_name):
-            shutil.rmtree(dir_name)
+            if dir_name == '__pycache__':
+                shutil.rmtree(dir_name, ignore_errors=True)
+            else:
+                _fast_rmtree(dir_name)
             print(f"Removed {dir_name}/")
     
-    # Clean .pyc files
-    for root, dirs, files in os.walk('.'):
-        for file in files:
-            if file.endswith('.pyc'):
-                os.remove(os.path.join(root, file))
-        # Remove __pycache__ directories
-        if '__pycache__' in dirs:
-            shutil.rmtree(os.path.join(root, '__pycache__'))
+    # Clean .pyc files and __pycache__ directories
+    # DirEntry caches its type from the directory read, so no extra stat()
+    # calls are needed, and removed __pycache__ trees are never descended into.
+    # Build output, VCS metadata and virtual environments are not walked
+    exclude = {'build', 'dist', '.git', '.venv', 'venv', 'env', '.env'}
+    stack = ['.']
+    while stack:
+        top = stack.pop()
+        with os.scandir(top) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name == '__pycache__':
+                        shutil.rmtree(entry.path, ignore_errors=True)
+                    elif entry.name not in exclude:
+                        stack.append(entry.path)
+                elif entry.name.endswith('.pyc'):
+                    os.unlink(entry.path)
+
+
+def _wheel_cache_dir():
+    """Get the wheel cache directory keyed by the requirements hash"""
+    with open('requirements.txt', 'rb') as f:
+        digest = hashlib.sha256(f.read())
+    # Wheels are interpreter and platform specific
+    digest.update(f"{sys.implementation.cache_tag}-{sys.platform}".encode())
+    return Path.home() / '.pastepal_build_cache' / digest.hexdigest()
+
+
+def _install_from_wheel_cache():
+    """Install dependencies from a local wheel cache, populating it if needed"""
+    cache_dir = _wheel_cache_dir()
+    sentinel = cache_dir / '.done'
+    
+    if sentinel.exists():
+        print(f"Using cached wheels from {cache_dir}")
+    else:
+        print(f"Populating wheel cache in {cache_dir}")
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        success = run_command(
+            [sys.executable, "-m", "pip", "download", "-d", str(cache_dir),
+             "-r", "requirements.txt", "pyinstaller"],
+            "Downloading dependencies to wheel cache"
+        )
+        if not success:
+            return False
+    
+    success = run_command(
+        [sys.executable, "-m", "pip", "install", "--no-index", "--find-links", str(cache_dir),
+         "-r", "requirements.txt", "pyinstaller"],
+        "Installing dependencies from wheel cache"
+    )
+    if success:
+        sentinel.touch()
+    return success
 
 
 def install_dependencies():
     """Install required dependencies"""
     print("Installing dependencies...")
     
-    # Install from requirements.txt
+    # Reuse previously downloaded wheels when requirements.txt is unchanged
     if os.path.exists('requirements.txt'):
-        success = run_command(
+        if _install_from_wheel_cache():
+            return True
+        print("Wheel cache install failed, falling back to online install")
+    
+    # requirements.txt pins PyInstaller, so one pip run installs everything
+    if os.path.exists('requirements.txt'):
+        return run_command(
             [sys.executable, "-m", "pip", "install", "-r", "requirements.txt"],
             "Installing Python dependencies"
         )
-        if not success:
-            return False
     
     # Install PyInstaller if not already installed
-    success = run_command(
+    return run_command(
         [sys.executable, "-m", "pip", "install", "pyinstaller"],
         "Installing PyInstaller"
     )
-    return success
 
 
 def build_executable():
@@ -2,19 +2,33 @@
 Clipboard monitoring service for PastePal
 """
 
-import time
-import threading
 from typing import Callable, Optional
-from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtCore import QObject, pyqtSignal, QBuffer, QIODevice
 from PyQt6.QtWidgets import QApplication
 from PyQt6.QtGui import QClipboard
-from PIL import Image
-import io
 import os
-import win32clipboard
-import win32con
+import re
+import stat
+import sys
+import hashlib
+from contextlib import contextmanager
 from .database import DatabaseManager, ClipboardItem, ContentType
 
+# The Win32 clipboard API is only used on Windows; elsewhere Qt's own
+# clipboard access covers the same ground
+if sys.platform == 'win32':
+    import win32clipboard
+    import win32con
+else:
+    win32clipboard = win32con = None
+
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_NEWLINE_TRANS = str.maketrans({'\n': ' ', '\r': ' ', '\t': ' '})
+
+# Leading markup that identifies a text payload as rich text
+_RICH_TEXT_PREFIXES = ('<html', '<!doctype', '<?xml', '<div', '<p', '<span')
+
 
 class ClipboardMonitor(QObject):
     """Monitors system clipboard for changes"""
@@ -25,79 +39,98 @@ class ClipboardMonitor(QObject):
     def __init__(self, db_manager: DatabaseManager):
         super().__init__()
         self.db_manager = db_manager
-        self.last_content = None
-        self.last_content_type = None
+        # Hash of the last captured content; full payloads are not retained
+        self.last_content_hash = None
+        self.last_seq = None
         self.monitoring = False
-        self.monitor_thread = None
-        self.check_interval = 0.5  # Check every 500ms
+        self.cleanup_interval = 50  # Prune history every 50 new items
+        self._adds_since_cleanup = 0
+        self.load_settings()
+    
+    def load_settings(self):
+        """Load the settings used on the capture path"""
+        self.max_history = int(self.db_manager.get_setting('max_history', '1000'))
         
     def start_monitoring(self):
-        """Start clipboard monitoring in a separate thread"""
+        """Start clipboard monitoring via the clipboard's change notifications"""
         if self.monitoring:
             return
             
         self.monitoring = True
-        self.monitor_thread = threading.Thread(target=self._monitor_loop, daemon=True)
-        self.monitor_thread.start()
+        QApplication.clipboard().dataChanged.connect(self._check_clipboard)
     
     def stop_monitoring(self):
         """Stop clipboard monitoring"""
+        if not self.monitoring:
+            return
+        
         self.monitoring = False
-        if self.monitor_thread:
-            self.monitor_thread.join(timeout=1.0)
-    
-    def _monitor_loop(self):
-        """Main monitoring loop"""
-        while self.monitoring:
+        clipboard = QApplication.clipboard()
+        if clipboard:
             try:
-                self._check_clipboard()
-                time.sleep(self.check_interval)
-            except Exception as e:
-                print(f"Error in clipboard monitoring: {e}")
-                time.sleep(1.0)
+                clipboard.dataChanged.disconnect(self._check_clipboard)
+            except TypeError:
+                pass
     
     def _check_clipboard(self):
         """Check if clipboard content has changed"""
         try:
+            # The sequence number changes on every clipboard write, so
+            # repeated notifications for the same content are skipped cheaply
+            if win32clipboard:
+                seq = win32clipboard.GetClipboardSequenceNumber()
+                if seq == self.last_seq:
+                    return
+                self.last_seq = seq
+            
             clipboard = QApplication.clipboard()
             if not clipboard:
                 return
+            
+            # Read the MIME data once and only probe the formats it offers
+            mime_data = clipboard.mimeData()
+            if mime_data is None:
+                return
                 
             # Check for text content
-            text_content = clipboard.text()
-            if text_content and text_content != self.last_content:
-                self._process_text_content(text_content)
-                self.last_content = text_content
-                return
-            
-            # Check for image content
-            image = clipboard.image()
-            if not image.isNull():
-                image_data = self._image_to_bytes(image)
-                if image_data != self.last_content:
-                    self._process_image_content(image_data)
-                    self.last_content = image_data
+            if mime_data.hasText():
+                text_content = mime_data.text()
+                text_hash = hash(text_content)
+                if text_content and text_hash != self.last_content_hash:
+                    self._process_text_content(text_content, mime_data)
+                    self.last_content_hash = text_hash
                     return
             
+            # Check for image content; only encode to PNG once the raw
+            # pixels are known to differ from the last captured image
+            if mime_data.hasImage():
+                image = clipboard.image()
+                if not image.isNull():
+                    image_hash = self._image_hash(image)
+                    if image_hash != self.last_content_hash:
+                        self._process_image_content(image, self._image_to_bytes(image))
+                        self.last_content_hash = image_hash
+                        return
+            
             # Check for file content
-            file_paths = self._get_file_paths()
-            if file_paths and file_paths != self.last_content:
-                self._process_file_content(file_paths)
-                self.last_content = file_paths
-                return
+            if mime_data.hasUrls():
+                file_paths = self._get_file_paths()
+                if file_paths:
+                    paths_hash = hash(tuple(file_paths))
+                    if paths_hash != self.last_content_hash:
+                        self._process_file_content(file_paths)
+                        self.last_content_hash = paths_hash
+                        return
                 
         except Exception as e:
             print(f"Error checking clipboard: {e}")
     
-    def _process_text_content(self, text: str):
+    def _process_text_content(self, text: str, mime_data=None):
         """Process text clipboard content"""
         if not text.strip():
             return
             
-        # Determine if it's rich text by checking for HTML tags
-        is_rich_text = '<' in text and '>' in text
-        
-        content_type = ContentType.RICH_TEXT if is_rich_text else ContentType.TEXT
+        content_type = ContentType.RICH_TEXT if self._is_rich_text(text, mime_data) else ContentType.TEXT
         preview = self._create_text_preview(text)
         
         from datetime import datetime
@@ -112,96 +145,133 @@ class ClipboardMonitor(QObject):
         
         self._save_and_emit_item(item)
     
-    def _process_image_content(self, image_data: bytes):
+    def _process_image_content(self, qimage, image_data: bytes):
         """Process image clipboard content"""
         try:
-            # Create a preview using PIL
-            image = Image.open(io.BytesIO(image_data))
-            preview = f"Image ({image.size[0]}x{image.size[1]}, {image.mode})"
-            
-            # Convert to base64 for storage
-            import base64
-            content = base64.b64encode(image_data).decode('utf-8')
-            
-            from datetime import datetime
-            item = ClipboardItem(
-                id=None,
-                content=content,
-                content_type=ContentType.IMAGE,
-                preview=preview,
-                timestamp=datetime.now(),
-                metadata={
-                    'width': image.size[0],
-                    'height': image.size[1],
-                    'mode': image.mode,
-                    'format': image.format
-                }
-            )
-            
-            self._save_and_emit_item(item)
-            
+            self._save_and_emit_item(self._create_image_item(qimage, image_data))
         except Exception as e:
             print(f"Error processing image: {e}")
     
+    def _create_image_item(self, qimage, image_data: bytes) -> ClipboardItem:
+        """Create a ClipboardItem for an image"""
+        # Size and pixel format come straight from the QImage, so the
+        # encoded bytes never need to be decoded again
+        width, height = qimage.width(), qimage.height()
+        mode = qimage.format().name.removeprefix('Format_')
+        
+        from datetime import datetime
+        return ClipboardItem(
+            id=None,
+            content=image_data,
+            content_type=ContentType.IMAGE,
+            preview=f"Image ({width}x{height}, {mode})",
+            timestamp=datetime.now(),
+            metadata={
+                'width': width,
+                'height': height,
+                'mode': mode,
+                'format': 'PNG'
+            }
+        )
+    
     def _process_file_content(self, file_paths: list):
         """Process file/folder clipboard content"""
         for path in file_paths:
-            if os.path.isfile(path):
-                content_type = ContentType.FILE
-                preview = f"File: {os.path.basename(path)}"
-            elif os.path.isdir(path):
-                content_type = ContentType.FOLDER
-                preview = f"Folder: {os.path.basename(path)}"
-            else:
+            item = self._create_path_item(path)
+            if item is None:
                 continue
             
-            from datetime import datetime
-            item = ClipboardItem(
-                id=None,
-                content=path,
-                content_type=content_type,
-                preview=preview,
-                timestamp=datetime.now(),
-                metadata={'path': path, 'exists': os.path.exists(path)}
-            )
-            
             self._save_and_emit_item(item)
     
+    def _create_path_item(self, path: str) -> Optional[ClipboardItem]:
+        """Create a ClipboardItem for a file or folder path"""
+        # A single stat() answers both the type and existence checks
+        try:
+            mode = os.stat(path).st_mode
+        except OSError:
+            return None
+        
+        if stat.S_ISREG(mode):
+            content_type = ContentType.FILE
+            preview = f"File: {os.path.basename(path)}"
+        elif stat.S_ISDIR(mode):
+            content_type = ContentType.FOLDER
+            preview = f"Folder: {os.path.basename(path)}"
+        else:
+            return None
+        
+        from datetime import datetime
+        return ClipboardItem(
+            id=None,
+            content=path,
+            content_type=content_type,
+            preview=preview,
+            timestamp=datetime.now(),
+            metadata={'path': path, 'exists': True, 'mode': mode}
+        )
+    
+    def _is_rich_text(self, text: str, mime_data=None) -> bool:
+        """Determine if text is rich text from its MIME data or leading markup"""
+        if mime_data is not None and mime_data.hasHtml():
+            return True
+        return text[:256].lstrip()[:16].lower().startswith(_RICH_TEXT_PREFIXES)
+    
     def _create_text_preview(self, text: str, max_length: int = 100) -> str:
         """Create a preview of text content"""
-        # Remove HTML tags for preview
-        import re
-        clean_text = re.sub(r'<[^>]+>', '', text)
+        # Remove HTML tags for preview; only the head of the text can end
+        # up in the preview, so large pastes are not scanned in full
+        clean_text = _TAG_RE.sub('', text[:max_length * 4])
         
-        # Replace newlines with spaces
-        clean_text = clean_text.replace('\n', ' ').replace('\r', ' ')
+        # Replace newlines and tabs with spaces
+        clean_text = clean_text.translate(_NEWLINE_TRANS)
         
         # Truncate if too long
         if len(clean_text) > max_length:
             return clean_text[:max_length] + "..."
         return clean_text
     
+    def _image_hash(self, image) -> int:
+        """Compute a cheap 64-bit hash of a QImage's raw pixel data"""
+        bits = image.constBits()
+        bits.setsize(image.sizeInBytes())
+        digest = hashlib.blake2b(bits, digest_size=8)
+        digest.update(f"{image.width()}x{image.height()}:{image.format().value}".encode())
+        return int.from_bytes(digest.digest(), 'little')
+    
     def _image_to_bytes(self, image) -> bytes:
-        """Convert QImage to bytes"""
-        buffer = io.BytesIO()
-        image.save(buffer, format='PNG')
-        return buffer.getvalue()
+        """Convert QImage to PNG bytes"""
+        buffer = QBuffer()
+        buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+        # Favour encode speed over size: quality 80 maps to zlib level 1
+        image.save(buffer, "PNG", 80)
+        return bytes(buffer.data())
+    
+    @contextmanager
+    def _clipboard_open(self):
+        """Hold the Win32 clipboard open for the duration of the block"""
+        win32clipboard.OpenClipboard()
+        try:
+            yield
+        finally:
+            win32clipboard.CloseClipboard()
     
     def _get_file_paths(self) -> list:
         """Get file paths from clipboard"""
+        if not win32clipboard:
+            mime_data = QApplication.clipboard().mimeData()
+            if mime_data is None:
+                return []
+            return [url.toLocalFile() for url in mime_data.urls() if url.isLocalFile()]
+        
         try:
-            win32clipboard.OpenClipboard()
-            if win32clipboard.IsClipboardFormatAvailable(win32con.CF_HDROP):
-                data = win32clipboard.GetClipboardData(win32con.CF_HDROP)
-                return list(data)
+            # Format availability can be queried without opening the
+            # clipboard, which most clipboard changes never need
+            if not win32clipboard.IsClipboardFormatAvailable(win32con.CF_HDROP):
+                return []
+            with self._clipboard_open():
+                return list(win32clipboard.GetClipboardData(win32con.CF_HDROP))
+        except Exception:
             return []
-        except:
-            return []
-        finally:
-            try:
-                win32clipboard.CloseClipboard()
-            except:
-                pass
     
     def _save_and_emit_item(self, item: ClipboardItem):
         """Save item to database and emit signal"""
@@ -209,9 +279,11 @@ class ClipboardMonitor(QObject):
             item.id = self.db_manager.add_item(item)
             self.clipboard_changed.emit(item)
             
-            # Cleanup old items
-            max_items = int(self.db_manager.get_setting('max_history', '1000'))
-            self.db_manager.cleanup_old_items(max_items)
+            # Cleanup old items periodically rather than on every copy
+            self._adds_since_cleanup += 1
+            if self._adds_since_cleanup >= self.cleanup_interval:
+                self._adds_since_cleanup = 0
+                self.db_manager.cleanup_old_items(self.max_history)
             
         except Exception as e:
             print(f"Error saving clipboard item: {e}")
@@ -226,7 +298,7 @@ class ClipboardMonitor(QObject):
             # Check text first
             text_content = clipboard.text()
             if text_content:
-                is_rich_text = '<' in text_content and '>' in text_content
+                is_rich_text = self._is_rich_text(text_content, clipboard.mimeData())
                 content_type = ContentType.RICH_TEXT if is_rich_text else ContentType.TEXT
                 preview = self._create_text_preview(text_content)
                 
@@ -243,50 +315,12 @@ class ClipboardMonitor(QObject):
             # Check image
             image = clipboard.image()
             if not image.isNull():
-                image_data = self._image_to_bytes(image)
-                image_obj = Image.open(io.BytesIO(image_data))
-                preview = f"Image ({image_obj.size[0]}x{image_obj.size[1]}, {image_obj.mode})"
-                
-                import base64
-                content = base64.b64encode(image_data).decode('utf-8')
-                
-                from datetime import datetime
-                return ClipboardItem(
-                    id=None,
-                    content=content,
-                    content_type=ContentType.IMAGE,
-                    preview=preview,
-                    timestamp=datetime.now(),
-                    metadata={
-                        'width': image_obj.size[0],
-                        'height': image_obj.size[1],
-                        'mode': image_obj.mode,
-                        'format': image_obj.format
-                    }
-                )
+                return self._create_image_item(image, self._image_to_bytes(image))
             
             # Check files
             file_paths = self._get_file_paths()
             if file_paths:
-                path = file_paths[0]  # Take first file
-                if os.path.isfile(path):
-                    content_type = ContentType.FILE
-                    preview = f"File: {os.path.basename(path)}"
-                elif os.path.isdir(path):
-                    content_type = ContentType.FOLDER
-                    preview = f"Folder: {os.path.basename(path)}"
-                else:
-                    return None
-                
-                from datetime import datetime
-                return ClipboardItem(
-                    id=None,
-                    content=path,
-                    content_type=content_type,
-                    preview=preview,
-                    timestamp=datetime.now(),
-                    metadata={'path': path, 'exists': os.path.exists(path)}
-                )
+                return self._create_path_item(file_paths[0])  # Take first file
             
             return None
             
@@ -5,8 +5,9 @@ Database models and operations for PastePal
 import sqlite3
 import json
 import os
+import threading
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple, Union
 from dataclasses import dataclass
 from enum import Enum
 
@@ -20,36 +21,36 @@ class ContentType(Enum):
     FOLDER = "folder"
 
 
-@dataclass
+# Direct value lookup avoids Enum.__call__ when decoding rows
+_CT_BY_VALUE = {ct.value: ct for ct in ContentType}
+
+# Kept as a single constant so sqlite3's statement cache reuses the
+# prepared INSERT on every add_item call
+_ADD_SQL = """
+    INSERT INTO clipboard_items 
+    (content, content_type, preview, timestamp, is_pinned, metadata)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+
+@dataclass(slots=True)
 class ClipboardItem:
     """Represents a clipboard item"""
     id: Optional[int]
-    content: str
+    content: Union[str, bytes]  # Raw bytes for images, text otherwise
     content_type: ContentType
     preview: str
     timestamp: datetime
     is_pinned: bool = False
     metadata: Optional[Dict[str, Any]] = None
 
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for database storage"""
-        return {
-            'id': self.id,
-            'content': self.content,
-            'content_type': self.content_type.value,
-            'preview': self.preview,
-            'timestamp': self.timestamp.isoformat(),
-            'is_pinned': self.is_pinned,
-            'metadata': json.dumps(self.metadata) if self.metadata else None
-        }
-
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'ClipboardItem':
         """Create from dictionary loaded from database"""
         return cls(
             id=data['id'],
             content=data['content'],
-            content_type=ContentType(data['content_type']),
+            content_type=_CT_BY_VALUE[data['content_type']],
             preview=data['preview'],
             timestamp=datetime.fromisoformat(data['timestamp']),
             is_pinned=bool(data['is_pinned']),
@@ -62,55 +63,140 @@ class DatabaseManager:
     
     def __init__(self, db_path: str = "pastepal.db"):
         self.db_path = db_path
+        # A single long-lived connection avoids reopening the database and
+        # re-running journal setup on every clipboard change
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        self._fts_enabled = False
+        self._configure_connection()
         self.init_database()
     
+    def _configure_connection(self):
+        """Apply connection-level pragmas"""
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA temp_store=MEMORY")
+            self._conn.execute("PRAGMA mmap_size=268435456")
+            self._conn.execute("PRAGMA cache_size=-32768")
+    
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+    
     def init_database(self):
         """Initialize the database with required tables"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            # Create clipboard_items table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS clipboard_items (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    content TEXT NOT NULL,
-                    content_type TEXT NOT NULL,
-                    preview TEXT NOT NULL,
-                    timestamp TEXT NOT NULL,
-                    is_pinned BOOLEAN DEFAULT 0,
-                    metadata TEXT
-                )
-            """)
-            
-            # Create settings table
+        with self._lock:
+            cursor = self._conn.cursor()
+            cursor.execute("BEGIN")
+            try:
+                # Create clipboard_items table
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS clipboard_items (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        content BLOB NOT NULL,
+                        content_type TEXT NOT NULL,
+                        preview TEXT NOT NULL,
+                        timestamp TEXT NOT NULL,
+                        is_pinned BOOLEAN DEFAULT 0,
+                        metadata TEXT
+                    )
+                """)
+                
+                # Create settings table
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS settings (
+                        key TEXT PRIMARY KEY,
+                        value TEXT NOT NULL
+                    )
+                """)
+                
+                # Indexes for history ordering, cleanup and type filtering
+                cursor.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_items_pinned_ts
+                    ON clipboard_items (is_pinned DESC, timestamp DESC)
+                """)
+                cursor.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_items_type
+                    ON clipboard_items (content_type)
+                """)
+                
+                # Full-text index for search
+                self._fts_enabled = self._init_fts(cursor)
+                
+                # Insert default settings
+                cursor.execute("""
+                    INSERT OR IGNORE INTO settings (key, value) VALUES 
+                    ('theme', 'light'),
+                    ('max_history', '1000'),
+                    ('hotkey', 'alt+v'),
+                    ('paste_hotkey', 'ctrl+shift+enter')
+                """)
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
+            cursor.execute("COMMIT")
+    
+    def _init_fts(self, cursor) -> bool:
+        """Create the FTS5 search index and its sync triggers.
+        
+        Returns False if this SQLite build lacks FTS5 with the trigram
+        tokenizer, in which case searches fall back to LIKE.
+        """
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'clipboard_fts'")
+        if cursor.fetchone():
+            return True
+        
+        try:
             cursor.execute("""
-                CREATE TABLE IF NOT EXISTS settings (
-                    key TEXT PRIMARY KEY,
-                    value TEXT NOT NULL
+                CREATE VIRTUAL TABLE clipboard_fts USING fts5(
+                    preview, content,
+                    content='clipboard_items', content_rowid='id',
+                    tokenize='trigram'
                 )
             """)
-            
-            # Insert default settings
-            cursor.execute("""
-                INSERT OR IGNORE INTO settings (key, value) VALUES 
-                ('theme', 'light'),
-                ('max_history', '1000'),
-                ('hotkey', 'alt+v'),
-                ('paste_hotkey', 'ctrl+shift+enter')
-            """)
-            
-            conn.commit()
+        except sqlite3.OperationalError:
+            return False
+        
+        # Only text content is indexed; the same expression must be used for
+        # inserts and deletes so the external-content index stays consistent
+        indexed_content = "CASE WHEN {0}.content_type IN ('text', 'rich_text') THEN {0}.content ELSE '' END"
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS clipboard_fts_ai AFTER INSERT ON clipboard_items BEGIN
+                INSERT INTO clipboard_fts (rowid, preview, content)
+                VALUES (new.id, new.preview, {indexed_content.format('new')});
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS clipboard_fts_ad AFTER DELETE ON clipboard_items BEGIN
+                INSERT INTO clipboard_fts (clipboard_fts, rowid, preview, content)
+                VALUES ('delete', old.id, old.preview, {indexed_content.format('old')});
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS clipboard_fts_au AFTER UPDATE OF content, preview ON clipboard_items BEGIN
+                INSERT INTO clipboard_fts (clipboard_fts, rowid, preview, content)
+                VALUES ('delete', old.id, old.preview, {indexed_content.format('old')});
+                INSERT INTO clipboard_fts (rowid, preview, content)
+                VALUES (new.id, new.preview, {indexed_content.format('new')});
+            END
+        """)
+        
+        # Index any history that predates the search table
+        cursor.execute(f"""
+            INSERT INTO clipboard_fts (rowid, preview, content)
+            SELECT id, preview, {indexed_content.format('clipboard_items')} FROM clipboard_items
+        """)
+        return True
     
     def add_item(self, item: ClipboardItem) -> int:
         """Add a new clipboard item"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO clipboard_items 
-                (content, content_type, preview, timestamp, is_pinned, metadata)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (
-                item.content,
+        with self._lock:
+            cursor = self._conn.execute(_ADD_SQL, (
+                sqlite3.Binary(item.content) if isinstance(item.content, bytes) else item.content,
                 item.content_type.value,
                 item.preview,
                 item.timestamp.isoformat(),
@@ -119,113 +205,164 @@ class DatabaseManager:
             ))
             return cursor.lastrowid
     
-    def get_items(self, limit: int = 100, search_query: str = None, 
-                  include_pinned: bool = True) -> List[ClipboardItem]:
-        """Get clipboard items with optional filtering"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            query = """
-                SELECT id, content, content_type, preview, timestamp, is_pinned, metadata
-                FROM clipboard_items
-                WHERE 1=1
-            """
-            params = []
-            
-            if search_query:
-                query += " AND (preview LIKE ? OR content LIKE ?)"
+    def _search_clause(self, search_query: str = None,
+                       include_pinned: bool = True) -> Tuple[str, list]:
+        """Build the WHERE conditions shared by item queries"""
+        clause = ""
+        params = []
+        
+        if search_query:
+            # The trigram tokenizer needs at least three characters to match
+            if self._fts_enabled and len(search_query) >= 3:
+                clause += " AND id IN (SELECT rowid FROM clipboard_fts WHERE clipboard_fts MATCH ?)"
+                params.append('"' + search_query.replace('"', '""') + '"')
+            else:
+                clause += (" AND (preview LIKE ? OR "
+                           "(content_type IN ('text', 'rich_text') AND content LIKE ?))")
                 search_term = f"%{search_query}%"
                 params.extend([search_term, search_term])
-            
-            if not include_pinned:
-                query += " AND is_pinned = 0"
-            
-            query += " ORDER BY is_pinned DESC, timestamp DESC LIMIT ?"
-            params.append(limit)
-            
-            cursor.execute(query, params)
-            rows = cursor.fetchall()
-            
-            items = []
-            for row in rows:
-                item_data = {
-                    'id': row[0],
-                    'content': row[1],
-                    'content_type': row[2],
-                    'preview': row[3],
-                    'timestamp': row[4],
-                    'is_pinned': row[5],
-                    'metadata': row[6]
-                }
-                items.append(ClipboardItem.from_dict(item_data))
-            
-            return items
+        
+        if not include_pinned:
+            clause += " AND is_pinned = 0"
+        
+        return clause, params
+    
+    def get_items(self, limit: int = 100, search_query: str = None, 
+                  include_pinned: bool = True,
+                  after: Optional[Tuple[bool, datetime, int]] = None) -> List[ClipboardItem]:
+        """Get clipboard items with optional filtering.
+        
+        Passing the (is_pinned, timestamp, id) key of the last item already
+        read returns the page that follows it, which stays correct while
+        items are added or re-pinned between pages.
+        """
+        clause, params = self._search_clause(search_query, include_pinned)
+        if after is not None:
+            clause += " AND (is_pinned, timestamp, id) < (?, ?, ?)"
+            params.extend([int(after[0]), after[1].isoformat(), after[2]])
+        query = f"""
+            SELECT id, content, content_type, preview, timestamp, is_pinned, metadata
+            FROM clipboard_items
+            WHERE 1=1{clause}
+            ORDER BY is_pinned DESC, timestamp DESC, id DESC LIMIT ?
+        """
+        params.append(limit)
+        
+        # Rows are decoded straight off the cursor without materializing
+        # an intermediate list of tuples
+        with self._lock:
+            cursor = self._conn.execute(query, params)
+            return [
+                ClipboardItem(
+                    id=row[0],
+                    content=row[1],
+                    content_type=_CT_BY_VALUE[row[2]],
+                    preview=row[3],
+                    timestamp=datetime.fromisoformat(row[4]),
+                    is_pinned=bool(row[5]),
+                    metadata=json.loads(row[6]) if row[6] else None
+                )
+                for row in cursor
+            ]
+    
+    def count_items(self, search_query: str = None, include_pinned: bool = True) -> int:
+        """Count clipboard items matching the same filters as get_items"""
+        clause, params = self._search_clause(search_query, include_pinned)
+        with self._lock:
+            cursor = self._conn.execute(
+                f"SELECT COUNT(*) FROM clipboard_items WHERE 1=1{clause}", params
+            )
+            return cursor.fetchone()[0]
+    
+    def update_item(self, item_id: int, content: str, preview: str):
+        """Update an item's content and preview in place"""
+        with self._lock:
+            self._conn.execute("""
+                UPDATE clipboard_items 
+                SET content = ?, preview = ? 
+                WHERE id = ?
+            """, (content, preview, item_id))
     
     def pin_item(self, item_id: int, pinned: bool = True):
         """Pin or unpin an item"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
+        with self._lock:
+            self._conn.execute("""
                 UPDATE clipboard_items 
                 SET is_pinned = ? 
                 WHERE id = ?
             """, (pinned, item_id))
-            conn.commit()
     
     def delete_item(self, item_id: int):
         """Delete an item"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM clipboard_items WHERE id = ?", (item_id,))
-            conn.commit()
+        with self._lock:
+            self._conn.execute("DELETE FROM clipboard_items WHERE id = ?", (item_id,))
     
     def clear_history(self, keep_pinned: bool = True):
         """Clear clipboard history"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+        with self._lock:
             if keep_pinned:
-                cursor.execute("DELETE FROM clipboard_items WHERE is_pinned = 0")
+                self._conn.execute("DELETE FROM clipboard_items WHERE is_pinned = 0")
             else:
-                cursor.execute("DELETE FROM clipboard_items")
-            conn.commit()
+                self._conn.execute("DELETE FROM clipboard_items")
     
     def get_setting(self, key: str, default: str = None) -> str:
         """Get a setting value"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT value FROM settings WHERE key = ?", (key,))
+        with self._lock:
+            cursor = self._conn.execute("SELECT value FROM settings WHERE key = ?", (key,))
             result = cursor.fetchone()
-            return result[0] if result else default
+        return result[0] if result else default
+    
+    def get_settings_bulk(self, defaults: Dict[str, str]) -> Dict[str, str]:
+        """Get several settings in one query, falling back to defaults"""
+        settings = dict(defaults)
+        if not defaults:
+            return settings
+        
+        keys = list(defaults)
+        placeholders = ','.join('?' * len(keys))
+        with self._lock:
+            cursor = self._conn.execute(
+                f"SELECT key, value FROM settings WHERE key IN ({placeholders})", keys
+            )
+            settings.update(cursor.fetchall())
+        return settings
     
     def set_setting(self, key: str, value: str):
         """Set a setting value"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
+        with self._lock:
+            self._conn.execute("""
                 INSERT OR REPLACE INTO settings (key, value) 
                 VALUES (?, ?)
             """, (key, value))
-            conn.commit()
+    
+    def set_settings_bulk(self, settings: Dict[str, str]):
+        """Set several settings in a single transaction"""
+        if not settings:
+            return
+        
+        with self._lock:
+            cursor = self._conn.cursor()
+            cursor.execute("BEGIN")
+            try:
+                cursor.executemany("""
+                    INSERT OR REPLACE INTO settings (key, value) 
+                    VALUES (?, ?)
+                """, settings.items())
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
+            cursor.execute("COMMIT")
     
     def cleanup_old_items(self, max_items: int = 1000):
         """Remove old items to keep database size manageable"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            # Get count of unpinned items
-            cursor.execute("SELECT COUNT(*) FROM clipboard_items WHERE is_pinned = 0")
-            unpinned_count = cursor.fetchone()[0]
-            
-            if unpinned_count > max_items:
-                # Delete oldest unpinned items
-                cursor.execute("""
-                    DELETE FROM clipboard_items 
+        with self._lock:
+            # Delete every unpinned item beyond the newest max_items
+            self._conn.execute("""
+                DELETE FROM clipboard_items 
+                WHERE id IN (
+                    SELECT id FROM clipboard_items 
                     WHERE is_pinned = 0 
-                    AND id IN (
-                        SELECT id FROM clipboard_items 
-                        WHERE is_pinned = 0 
-                        ORDER BY timestamp ASC 
-                        LIMIT ?
-                    )
-                """, (unpinned_count - max_items,))
-                conn.commit()
+                    ORDER BY timestamp DESC 
+                    LIMIT -1 OFFSET ?
+                )
+            """, (max_items,))
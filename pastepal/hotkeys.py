@@ -2,13 +2,63 @@
 Global hotkey management for PastePal
 """
 
-import threading
-import time
+import functools
 from typing import Dict, Callable, Optional
 from PyQt6.QtCore import QObject, pyqtSignal
 import keyboard
 
 
+# Key names that differ between our settings and the keyboard library
+_ALIAS = {'escape': 'esc'}
+
+# Keys accepted in hotkey combinations
+_AVAILABLE_KEYS = (
+    # Letters
+    'a', 'b', 'c', 'd', 'e', 'f', 'g', 'h', 'i', 'j', 'k', 'l', 'm',
+    'n', 'o', 'p', 'q', 'r', 's', 't', 'u', 'v', 'w', 'x', 'y', 'z',
+    # Numbers
+    '0', '1', '2', '3', '4', '5', '6', '7', '8', '9',
+    # Special keys
+    'enter', 'space', 'tab', 'escape', 'backspace', 'delete',
+    # Function keys
+    'f1', 'f2', 'f3', 'f4', 'f5', 'f6', 'f7', 'f8', 'f9', 'f10', 'f11', 'f12',
+    # Arrow keys
+    'up', 'down', 'left', 'right',
+    # Modifier keys
+    'ctrl', 'alt', 'shift', 'win'
+)
+_VALID_KEYS = frozenset(_AVAILABLE_KEYS)
+_MODIFIERS = ('ctrl', 'alt', 'shift', 'win')
+
+
+@functools.lru_cache(maxsize=256)
+def _format_combo(combination: str) -> str:
+    """Canonicalize a key combination for the keyboard library"""
+    parts = [part.strip() for part in combination.lower().split('+')]
+    return '+'.join(_ALIAS.get(part, part) for part in parts)
+
+
+@functools.lru_cache(maxsize=512)
+def _is_valid_combo(combination: str) -> bool:
+    """Check a key combination against the available keys"""
+    combination = combination.lower().strip()
+    
+    # Must not be empty
+    if not combination:
+        return False
+    
+    # Split by + to get individual keys
+    keys = [key.strip() for key in combination.split('+')]
+    
+    # Check for reasonable combination length (max 4 keys)
+    if len(keys) > 4:
+        return False
+    
+    # Keys must be valid and not repeated
+    unique_keys = set(keys)
+    return len(unique_keys) == len(keys) and unique_keys <= _VALID_KEYS
+
+
 class HotkeyManager(QObject):
     """Manages global hotkeys for the application"""
     
@@ -17,9 +67,7 @@ class HotkeyManager(QObject):
     def __init__(self):
         super().__init__()
         self.hotkeys = {}
-        self.hotkey_thread = None
         self.running = False
-        self.hotkey_callbacks = {}
         
     def register_hotkey(self, name: str, key_combination: str, callback: Callable = None):
         """Register a global hotkey"""
@@ -63,33 +111,7 @@ class HotkeyManager(QObject):
     
     def _format_key_combination(self, combination: str) -> str:
         """Convert key combination string to keyboard library format"""
-        # Convert common formats
-        combination = combination.lower().strip()
-        
-        # Replace common modifiers
-        combination = combination.replace('ctrl', 'ctrl')
-        combination = combination.replace('alt', 'alt')
-        combination = combination.replace('shift', 'shift')
-        combination = combination.replace('win', 'win')
-        
-        # Replace common special keys
-        combination = combination.replace('enter', 'enter')
-        combination = combination.replace('space', 'space')
-        combination = combination.replace('tab', 'tab')
-        combination = combination.replace('escape', 'esc')
-        combination = combination.replace('esc', 'esc')
-        
-        # Replace function keys
-        for i in range(1, 13):
-            combination = combination.replace(f'f{i}', f'f{i}')
-        
-        # Replace arrow keys
-        combination = combination.replace('up', 'up')
-        combination = combination.replace('down', 'down')
-        combination = combination.replace('left', 'left')
-        combination = combination.replace('right', 'right')
-        
-        return combination
+        return _format_combo(combination)
     
     def _on_hotkey_triggered(self, name: str):
         """Handle hotkey trigger"""
@@ -138,34 +160,11 @@ class HotkeyManager(QObject):
     
     def validate_key_combination(self, combination: str) -> bool:
         """Validate if a key combination is valid"""
-        try:
-            formatted = self._format_key_combination(combination)
-            # Try to register and immediately unregister to test validity
-            test_name = f"test_{int(time.time())}"
-            if self.register_hotkey(test_name, combination):
-                self.unregister_hotkey(test_name)
-                return True
-            return False
-        except:
-            return False
+        return HotkeyValidator.is_valid_combination(combination)
     
     def get_available_keys(self) -> list:
         """Get list of available keys for hotkey combinations"""
-        return [
-            # Letters
-            'a', 'b', 'c', 'd', 'e', 'f', 'g', 'h', 'i', 'j', 'k', 'l', 'm',
-            'n', 'o', 'p', 'q', 'r', 's', 't', 'u', 'v', 'w', 'x', 'y', 'z',
-            # Numbers
-            '0', '1', '2', '3', '4', '5', '6', '7', '8', '9',
-            # Special keys
-            'enter', 'space', 'tab', 'escape', 'backspace', 'delete',
-            # Function keys
-            'f1', 'f2', 'f3', 'f4', 'f5', 'f6', 'f7', 'f8', 'f9', 'f10', 'f11', 'f12',
-            # Arrow keys
-            'up', 'down', 'left', 'right',
-            # Modifier keys
-            'ctrl', 'alt', 'shift', 'win'
-        ]
+        return list(_AVAILABLE_KEYS)
     
     def get_example_combinations(self) -> list:
         """Get example hotkey combinations"""
@@ -190,59 +189,31 @@ class HotkeyValidator:
         """Check if a key combination is valid"""
         if not combination or not isinstance(combination, str):
             return False
-        
-        combination = combination.lower().strip()
-        
-        # Must not be empty
-        if not combination:
-            return False
-        
-        # Split by + to get individual keys
-        keys = [key.strip() for key in combination.split('+')]
-        
-        # Must have at least one key
-        if not keys:
-            return False
-        
-        # Check for valid keys
-        valid_keys = HotkeyManager().get_available_keys()
-        
-        for key in keys:
-            if key not in valid_keys:
-                return False
-        
-        # Check for reasonable combination length (max 4 keys)
-        if len(keys) > 4:
-            return False
-        
-        # Check for duplicate keys
-        if len(keys) != len(set(keys)):
-            return False
-        
-        return True
+        return _is_valid_combo(combination)
     
     @staticmethod
     def suggest_combination(base_key: str) -> list:
         """Suggest hotkey combinations based on a base key"""
-        suggestions = []
-        
-        # Single key
-        if HotkeyValidator.is_valid_combination(base_key):
-            suggestions.append(base_key)
-        
-        # With modifiers
-        modifiers = ['ctrl', 'alt', 'shift', 'win']
-        
-        for modifier in modifiers:
-            combination = f"{modifier}+{base_key}"
-            if HotkeyValidator.is_valid_combination(combination):
-                suggestions.append(combination)
-        
-        # With two modifiers
-        for i, mod1 in enumerate(modifiers):
-            for mod2 in modifiers[i+1:]:
-                combination = f"{mod1}+{mod2}+{base_key}"
-                if HotkeyValidator.is_valid_combination(combination):
-                    suggestions.append(combination)
+        if not base_key or not isinstance(base_key, str):
+            return []
+        
+        # The base may itself be a combination such as "ctrl+v"; if any of
+        # its keys is invalid, every candidate built on it is too
+        if not _is_valid_combo(base_key):
+            return []
+        keys = {key.strip() for key in base_key.lower().split('+')}
+        
+        # Every candidate is valid by construction: a valid base plus
+        # distinct modifiers it does not already contain, up to four keys
+        modifiers = [modifier for modifier in _MODIFIERS if modifier not in keys]
+        suggestions = [base_key]
+        if len(keys) <= 3:
+            suggestions.extend(f"{modifier}+{base_key}" for modifier in modifiers)
+        if len(keys) <= 2:
+            suggestions.extend(
+                f"{mod1}+{mod2}+{base_key}"
+                for i, mod1 in enumerate(modifiers)
+                for mod2 in modifiers[i+1:]
+            )
         
         return suggestions[:5]  # Return top 5 suggestions
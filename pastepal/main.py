@@ -4,19 +4,41 @@ Main application entry point for PastePal
 
 import sys
 import os
+import re
 from PyQt6.QtWidgets import QApplication, QMessageBox
 from PyQt6.QtCore import QTimer, QObject, pyqtSignal
 from PyQt6.QtGui import QIcon
 
-from .database import DatabaseManager
+from .database import DatabaseManager, ContentType
 from .clipboard_monitor import ClipboardMonitor
 from .hotkeys import HotkeyManager
+from .paste import simulate_paste, paste_item
 from .ui.main_window import MainWindow
 from .ui.system_tray import SystemTrayManager
 from .ui.themes import ThemeManager
 from .ui.settings_dialog import SettingsDialog
 
 
+# Hotkey names, interned so dispatch lookups compare by identity
+_SHOW, _PASTE, _QUICK = map(sys.intern, ('show_window', 'paste_plain', 'quick_paste'))
+
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_PLAIN_TYPES = frozenset({ContentType.TEXT, ContentType.RICH_TEXT})
+_TYPE_TITLES = {ct: ct.value.title() for ct in ContentType}
+
+# Settings read by the application, with their defaults
+_SETTING_DEFAULTS = {
+    'theme': 'light',
+    'start_minimized': 'true',
+    'monitor_enabled': 'true',
+    'clear_on_exit': 'false',
+    'show_notifications': 'true',
+    'hotkey': 'alt+v',
+    'paste_hotkey': 'ctrl+shift+enter',
+    'quick_paste_hotkey': 'ctrl+alt+v'
+}
+
+
 class PastePalApp(QObject):
     """Main application class"""
     
@@ -31,15 +53,31 @@ class PastePalApp(QObject):
         self.main_window = None
         self.system_tray = None
         self.settings_dialog = None
+        self._settings = dict(_SETTING_DEFAULTS)
         
         # Application state
         self.is_running = False
         self.start_minimized = True
+        self.monitor_enabled = True
+        self.clear_on_exit = False
+        self.show_notifications = True
+        self._dispatch = {
+            _SHOW: self.show_main_window,
+            _PASTE: self.paste_as_plain_text,
+            _QUICK: self.quick_paste
+        }
         
         # Setup application
         self.setup_application()
         self.setup_connections()
         self.load_settings()
+        
+        # The tray, hotkeys and monitoring aren't needed until the event
+        # loop is running, so build them on its first iteration
+        QTimer.singleShot(0, self._deferred_init)
+    
+    def _deferred_init(self):
+        """Set up components that can wait for the event loop"""
         self.setup_hotkeys()
         self.setup_system_tray()
         
@@ -96,24 +134,28 @@ class PastePalApp(QObject):
     
     def load_settings(self):
         """Load settings from database"""
+        self._settings = self.db_manager.get_settings_bulk(_SETTING_DEFAULTS)
+        
         # Load theme
-        theme_name = self.db_manager.get_setting('theme', 'light')
-        self.theme_manager.set_theme(theme_name)
+        self.theme_manager.set_theme(self._settings['theme'])
         
         # Load startup settings
-        self.start_minimized = self.db_manager.get_setting('start_minimized', 'true') == 'true'
+        self.start_minimized = self._settings['start_minimized'] == 'true'
+        self.monitor_enabled = self._settings['monitor_enabled'] == 'true'
+        self.clear_on_exit = self._settings['clear_on_exit'] == 'true'
+        self.show_notifications = self._settings['show_notifications'] == 'true'
     
     def setup_hotkeys(self):
         """Setup global hotkeys"""
         # Get hotkey settings
-        show_hotkey = self.db_manager.get_setting('hotkey', 'alt+v')
-        paste_hotkey = self.db_manager.get_setting('paste_hotkey', 'ctrl+shift+enter')
-        quick_paste_hotkey = self.db_manager.get_setting('quick_paste_hotkey', 'ctrl+alt+v')
+        show_hotkey = self._settings['hotkey']
+        paste_hotkey = self._settings['paste_hotkey']
+        quick_paste_hotkey = self._settings['quick_paste_hotkey']
         
         # Register hotkeys
-        self.hotkey_manager.register_hotkey('show_window', show_hotkey)
-        self.hotkey_manager.register_hotkey('paste_plain', paste_hotkey)
-        self.hotkey_manager.register_hotkey('quick_paste', quick_paste_hotkey)
+        self.hotkey_manager.register_hotkey(_SHOW, show_hotkey)
+        self.hotkey_manager.register_hotkey(_PASTE, paste_hotkey)
+        self.hotkey_manager.register_hotkey(_QUICK, quick_paste_hotkey)
         
         # Start monitoring
         self.hotkey_manager.start_monitoring()
@@ -128,8 +170,7 @@ class PastePalApp(QObject):
     def start_services(self):
         """Start background services"""
         # Start clipboard monitoring
-        monitor_enabled = self.db_manager.get_setting('monitor_enabled', 'true') == 'true'
-        if monitor_enabled:
+        if self.monitor_enabled:
             self.clipboard_monitor.start_monitoring()
             self.system_tray.update_status('active')
         else:
@@ -148,8 +189,7 @@ class PastePalApp(QObject):
         self.hotkey_manager.stop_monitoring()
         
         # Clear clipboard history on exit if setting is enabled
-        clear_on_exit = self.db_manager.get_setting('clear_on_exit', 'false') == 'true'
-        if clear_on_exit:
+        if self.clear_on_exit:
             self.db_manager.clear_history(keep_pinned=True)
     
     def show_main_window(self):
@@ -180,6 +220,7 @@ class PastePalApp(QObject):
         if self.settings_dialog is None:
             self.settings_dialog = SettingsDialog(self.db_manager, self.theme_manager)
             self.settings_dialog.settings_changed.connect(self.on_settings_changed)
+            self.settings_dialog.history_cleared.connect(self.on_history_cleared)
         
         self.settings_dialog.show()
         self.settings_dialog.raise_()
@@ -194,9 +235,12 @@ class PastePalApp(QObject):
         self.hotkey_manager.unregister_all_hotkeys()
         self.setup_hotkeys()
         
+        # Apply the history limit right away since cleanup is throttled
+        self.clipboard_monitor.load_settings()
+        self.db_manager.cleanup_old_items(self.clipboard_monitor.max_history)
+        
         # Update clipboard monitoring
-        monitor_enabled = self.db_manager.get_setting('monitor_enabled', 'true') == 'true'
-        if monitor_enabled:
+        if self.monitor_enabled:
             if not self.clipboard_monitor.monitoring:
                 self.clipboard_monitor.start_monitoring()
             self.system_tray.update_status('active')
@@ -207,16 +251,27 @@ class PastePalApp(QObject):
         
         # Update main window if it exists
         if self.main_window:
+            self.main_window.invalidate_cache()
+            self.main_window.load_clipboard_history()
+    
+    def on_history_cleared(self):
+        """Refresh the main window after the history is cleared"""
+        if self.main_window:
+            self.main_window.invalidate_cache()
             self.main_window.load_clipboard_history()
     
     def on_clipboard_changed(self, item):
         """Handle clipboard content change"""
-        # Update status in system tray
-        self.system_tray.set_tooltip(f"PastePal - {item.content_type.value.title()}: {item.preview[:50]}...")
+        # Cached search results no longer include the newest item
+        if self.main_window:
+            self.main_window.invalidate_cache()
+        
+        # Update status in system tray; previews are already bounded by
+        # the clipboard monitor, so this slice stays short
+        self.system_tray.set_tooltip(f"PastePal - {_TYPE_TITLES[item.content_type]}: {item.preview[:50]}...")
         
         # Show notification if enabled
-        show_notifications = self.db_manager.get_setting('show_notifications', 'true') == 'true'
-        if show_notifications and self.system_tray.tray_icon:
+        if self.show_notifications and self.system_tray.tray_icon:
             from PyQt6.QtWidgets import QSystemTrayIcon
             self.system_tray.show_message(
                 "Clipboard Updated",
@@ -226,12 +281,9 @@ class PastePalApp(QObject):
     
     def on_hotkey_triggered(self, hotkey_name):
         """Handle hotkey trigger"""
-        if hotkey_name == 'show_window':
-            self.show_main_window()
-        elif hotkey_name == 'paste_plain':
-            self.paste_as_plain_text()
-        elif hotkey_name == 'quick_paste':
-            self.quick_paste()
+        handler = self._dispatch.get(sys.intern(hotkey_name))
+        if handler:
+            handler()
     
     def paste_as_plain_text(self):
         """Paste current clipboard content as plain text"""
@@ -240,29 +292,24 @@ class PastePalApp(QObject):
         else:
             # Get current clipboard content and paste as plain text
             current_item = self.clipboard_monitor.get_clipboard_content()
-            if current_item and current_item.content_type in ['text', 'rich_text']:
-                import re
-                plain_text = re.sub(r'<[^>]+>', '', current_item.content)
-                from PyQt6.QtWidgets import QApplication
+            if current_item and current_item.content_type in _PLAIN_TYPES:
+                # Only rich text carries markup worth stripping
+                if current_item.content_type == ContentType.RICH_TEXT:
+                    plain_text = _HTML_TAG_RE.sub('', current_item.content)
+                else:
+                    plain_text = current_item.content
                 QApplication.clipboard().setText(plain_text)
-                self.simulate_paste()
+                simulate_paste()
     
     def quick_paste(self):
         """Quick paste the most recent item"""
         if self.main_window and self.main_window.isVisible():
             self.main_window.paste_selected_item()
         else:
-            # Get most recent item and paste it
+            # Get most recent item and paste it without building a window
             items = self.db_manager.get_items(limit=1)
             if items:
-                self.main_window = MainWindow(self.db_manager, self.theme_manager)
-                self.main_window.current_selected_item = items[0]
-                self.main_window.paste_selected_item()
-    
-    def simulate_paste(self):
-        """Simulate Ctrl+V keypress"""
-        import keyboard
-        keyboard.send('ctrl+v')
+                paste_item(items[0])
     
     def quit_application(self):
         """Quit the application"""
@@ -292,6 +339,7 @@ class PastePalApp(QObject):
             return 1
         finally:
             self.stop_services()
+            self.db_manager.close()
 
 
 def main():
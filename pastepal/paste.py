@@ -0,0 +1,232 @@
+"""
+Clipboard paste helpers for PastePal
+"""
+
+import base64
+import functools
+import io
+import sys
+from typing import Callable, Optional
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from PyQt6.QtGui import QImage, QPixmap
+from PIL import Image
+import keyboard
+from .database import ClipboardItem, ContentType
+
+
+if sys.platform == 'win32':
+    import ctypes
+    from ctypes import wintypes
+
+    _INPUT_KEYBOARD = 1
+    _KEYEVENTF_KEYUP = 0x0002
+    _VK_CONTROL = 0x11
+    _VK_V = 0x56
+
+    class _MOUSEINPUT(ctypes.Structure):
+        _fields_ = [
+            ('dx', wintypes.LONG),
+            ('dy', wintypes.LONG),
+            ('mouseData', wintypes.DWORD),
+            ('dwFlags', wintypes.DWORD),
+            ('time', wintypes.DWORD),
+            ('dwExtraInfo', ctypes.c_size_t)
+        ]
+
+    class _KEYBDINPUT(ctypes.Structure):
+        _fields_ = [
+            ('wVk', wintypes.WORD),
+            ('wScan', wintypes.WORD),
+            ('dwFlags', wintypes.DWORD),
+            ('time', wintypes.DWORD),
+            ('dwExtraInfo', ctypes.c_size_t)
+        ]
+
+    class _INPUTUNION(ctypes.Union):
+        # The mouse member sizes the union to match the Win32 INPUT struct
+        _fields_ = [('mi', _MOUSEINPUT), ('ki', _KEYBDINPUT)]
+
+    class _INPUT(ctypes.Structure):
+        _fields_ = [('type', wintypes.DWORD), ('union', _INPUTUNION)]
+
+    def _key_input(vk: int, flags: int = 0) -> '_INPUT':
+        """Build a keyboard INPUT record for SendInput"""
+        return _INPUT(type=_INPUT_KEYBOARD, union=_INPUTUNION(ki=_KEYBDINPUT(wVk=vk, dwFlags=flags)))
+
+    _user32 = ctypes.WinDLL('user32', use_last_error=True)
+    _user32.SendInput.argtypes = (wintypes.UINT, ctypes.POINTER(_INPUT), ctypes.c_int)
+    _user32.SendInput.restype = wintypes.UINT
+
+    # Ctrl down, V down, V up, Ctrl up, built once and reused for every paste
+    _PASTE_INPUTS = (_INPUT * 4)(
+        _key_input(_VK_CONTROL),
+        _key_input(_VK_V),
+        _key_input(_VK_V, _KEYEVENTF_KEYUP),
+        _key_input(_VK_CONTROL, _KEYEVENTF_KEYUP)
+    )
+elif sys.platform.startswith('linux'):
+    import ctypes
+    import ctypes.util
+
+    _XK_CONTROL_L = 0xffe3
+    _XK_V = 0x0076
+
+    # XTest injects the paste keystroke without the keyboard library's
+    # global hook; missing libraries fall back to keyboard.send
+    try:
+        _xlib = ctypes.CDLL(ctypes.util.find_library('X11'))
+        _xtst = ctypes.CDLL(ctypes.util.find_library('Xtst'))
+        _xlib.XOpenDisplay.argtypes = (ctypes.c_char_p,)
+        _xlib.XOpenDisplay.restype = ctypes.c_void_p
+        _xlib.XKeysymToKeycode.argtypes = (ctypes.c_void_p, ctypes.c_ulong)
+        _xlib.XKeysymToKeycode.restype = ctypes.c_ubyte
+        _xlib.XFlush.argtypes = (ctypes.c_void_p,)
+        _xtst.XTestFakeKeyEvent.argtypes = (ctypes.c_void_p, ctypes.c_uint, ctypes.c_int, ctypes.c_ulong)
+    except (OSError, TypeError, AttributeError):
+        _xlib = _xtst = None
+
+
+# PIL modes whose raw bytes Qt can wrap directly, with bytes per pixel
+_QIMAGE_FORMATS = {
+    'RGB': (QImage.Format.Format_RGB888, 3),
+    'RGBA': (QImage.Format.Format_RGBA8888, 4),
+    'L': (QImage.Format.Format_Grayscale8, 1)
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _paste_hotkey():
+    """Parse the paste key sequence for the keyboard library once"""
+    return keyboard.parse_hotkey('ctrl+v')
+
+
+@functools.lru_cache(maxsize=None)
+def _x11_paste_keys():
+    """Open the X display and resolve the paste keycodes once"""
+    if not sys.platform.startswith('linux') or _xtst is None:
+        return None
+    display = _xlib.XOpenDisplay(None)
+    if not display:
+        return None
+    return (
+        display,
+        _xlib.XKeysymToKeycode(display, _XK_CONTROL_L),
+        _xlib.XKeysymToKeycode(display, _XK_V)
+    )
+
+
+def decode_image(image_data: bytes) -> QImage:
+    """Decode stored image bytes into a QImage"""
+    # Stored images are PNG, which Qt decodes natively without an
+    # intermediate PIL buffer
+    qimage = QImage.fromData(image_data)
+    if not qimage.isNull():
+        return qimage
+    
+    image = Image.open(io.BytesIO(image_data))
+    if image.mode not in _QIMAGE_FORMATS:
+        image = image.convert('RGBA')
+    image_format, depth = _QIMAGE_FORMATS[image.mode]
+    data = image.tobytes()
+    qimage = QImage(data, image.width, image.height, image.width * depth, image_format)
+    # QImage wraps the buffer without copying it, so keep it alive
+    qimage._buf = data
+    return qimage
+
+
+class _DecodeSignals(QObject):
+    """Carries a decoded image back to the GUI thread"""
+    
+    decoded = pyqtSignal(QImage)
+    
+    def __init__(self):
+        super().__init__()
+        self.image = None
+
+
+class DecodeImageTask(QRunnable):
+    """Decode stored image content on a worker thread"""
+    
+    def __init__(self, content):
+        super().__init__()
+        self.content = content
+        self.signals = _DecodeSignals()
+    
+    def run(self):
+        """Decode the image and hand it to the GUI thread"""
+        try:
+            # Images are stored as raw bytes; older rows hold base64 text
+            if isinstance(self.content, bytes):
+                image_data = self.content
+            else:
+                image_data = base64.b64decode(self.content)
+            image = decode_image(image_data)
+        except Exception as e:
+            print(f"Error decoding image: {e}")
+            image = QImage()
+        
+        # Holding the image on the signals object keeps any wrapped PIL
+        # buffer alive until the queued slot has run
+        self.signals.image = image
+        self.signals.decoded.emit(image)
+
+
+# Decode signal objects waiting for delivery on the GUI thread
+_pending_decodes = set()
+
+
+def _on_image_decoded(signals: _DecodeSignals, callback: Optional[Callable], image: QImage):
+    """Put a decoded image on the clipboard, then run the callback"""
+    _pending_decodes.discard(signals)
+    if image.isNull():
+        return
+    
+    # QPixmap and QClipboard must only be used on the GUI thread
+    QApplication.clipboard().setPixmap(QPixmap.fromImage(image))
+    if callback:
+        callback()
+
+
+def copy_item_to_clipboard(item: ClipboardItem, callback: Optional[Callable] = None):
+    """Copy item content to system clipboard, then run the optional callback"""
+    clipboard = QApplication.clipboard()
+    
+    if item.content_type == ContentType.TEXT or item.content_type == ContentType.RICH_TEXT:
+        clipboard.setText(item.content)
+    elif item.content_type == ContentType.IMAGE:
+        # Decoding can take a while for large images, so it runs off the
+        # GUI thread and the callback fires once the clipboard is set
+        task = DecodeImageTask(item.content)
+        _pending_decodes.add(task.signals)
+        task.signals.decoded.connect(functools.partial(_on_image_decoded, task.signals, callback))
+        QThreadPool.globalInstance().start(task)
+        return
+    elif item.content_type in [ContentType.FILE, ContentType.FOLDER]:
+        # For files, we can't directly set file paths to clipboard
+        # Instead, copy the path as text
+        clipboard.setText(item.content)
+    
+    if callback:
+        callback()
+
+
+def simulate_paste():
+    """Simulate Ctrl+V keypress to paste"""
+    if sys.platform == 'win32':
+        _user32.SendInput(len(_PASTE_INPUTS), _PASTE_INPUTS, ctypes.sizeof(_INPUT))
+        return
+    
+    x11_keys = _x11_paste_keys()
+    if x11_keys:
+        display, ctrl, v = x11_keys
+        for keycode, pressed in ((ctrl, True), (v, True), (v, False), (ctrl, False)):
+            _xtst.XTestFakeKeyEvent(display, keycode, pressed, 0)
+        _xlib.XFlush(display)
+    else:
+        keyboard.send(_paste_hotkey())
+
+
+def paste_item(item: ClipboardItem):
+    """Copy an item to the clipboard and paste it into the focused window"""
+    copy_item_to_clipboard(item, simulate_paste)
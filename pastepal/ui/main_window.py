@@ -3,182 +3,403 @@ Main window UI for PastePal
 """
 
 import os
-import base64
-import io
-from typing import List, Optional
+import re
+from collections import OrderedDict
+from functools import partial
+from typing import Dict, List, Optional
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, 
-    QListWidget, QListWidgetItem, QLabel, QPushButton, QMenu,
-    QApplication, QFrame, QSplitter, QScrollArea, QSizePolicy
+    QLabel, QPushButton, QMenu, QApplication, QFrame, QSplitter,
+    QListView, QStyledItemDelegate, QStyle
+)
+from PyQt6.QtCore import (
+    Qt, QTimer, pyqtSignal, QSize, QPoint, QRect, QObject,
+    QAbstractListModel, QModelIndex, QRunnable, QThreadPool
 )
-from PyQt6.QtCore import Qt, QTimer, pyqtSignal, QSize, QPoint
 from PyQt6.QtGui import (
     QIcon, QPixmap, QFont, QPalette, QColor, QAction, 
-    QKeySequence, QClipboard, QPainter, QPen
+    QKeySequence, QClipboard, QPainter, QPen, QGuiApplication
 )
-from PIL import Image
 from .themes import ThemeManager
 from ..database import ClipboardItem, ContentType, DatabaseManager
 from ..clipboard_monitor import ClipboardMonitor
+from ..paste import copy_item_to_clipboard, simulate_paste, paste_item
+
+
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_NEWLINE_TRANS = str.maketrans({'\n': ' ', '\r': ' '})
+
+
+def _title_case(text: str) -> str:
+    """Title-case text, using the ASCII-only bytes path when possible"""
+    # bytes.title follows the same rules as str.title for ASCII input
+    # without consulting the Unicode tables
+    if text.isascii():
+        return text.encode('ascii').title().decode('ascii')
+    return text.title()
+
+
+# Emoji shown for each content type
+_ICON_FOR = {
+    ContentType.TEXT: "📝",
+    ContentType.RICH_TEXT: "📝",
+    ContentType.IMAGE: "🖼️",
+    ContentType.FILE: "📄",
+    ContentType.FOLDER: "📁"
+}
+
+# Text transforms offered in the item context menu
+_TRANSFORMS = {
+    'uppercase': str.upper,
+    'lowercase': str.lower,
+    'titlecase': _title_case,
+    'trim': str.strip
+}
+
+
+class ClipboardListModel(QAbstractListModel):
+    """List model exposing clipboard items to the history view"""
+    
+    PAGE_SIZE = 20
+    QUERY_CACHE_SIZE = 16
+    
+    def __init__(self, db_manager: DatabaseManager, parent=None):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self._items: List[ClipboardItem] = []
+        self._row_by_id: Dict[int, int] = {}
+        self._search_query = None
+        self._has_more = False
+        self._total = 0
+        # Sort key of the last row read from the database; items are edited
+        # in place, so it is captured when the row is fetched
+        self._page_after = None
+        # First page and total count of recent queries, most recent last
+        self._query_cache: OrderedDict = OrderedDict()
+        self._cache_generation = 0
+    
+    def rowCount(self, parent=QModelIndex()) -> int:
+        """Number of items in the model"""
+        if parent.isValid():
+            return 0
+        return len(self._items)
+    
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        """Return item data for the given role"""
+        if not index.isValid():
+            return None
+        
+        item = self._items[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return item.preview
+        elif role == Qt.ItemDataRole.UserRole:
+            return item
+        return None
+    
+    def set_items(self, items: List[ClipboardItem]):
+        """Replace all items in the model"""
+        self.beginResetModel()
+        self._items = items
+        self._row_by_id = {item.id: row for row, item in enumerate(items)}
+        self._page_after = self._sort_key(items[-1]) if items else None
+        self.endResetModel()
+    
+    @staticmethod
+    def _sort_key(item: ClipboardItem) -> tuple:
+        """Key of an item in the history ordering"""
+        return (item.is_pinned, item.timestamp, item.id)
+    
+    @staticmethod
+    def _cache_key(search_query: Optional[str]) -> str:
+        """Searches ignore case, so queries differing only in case share results"""
+        return search_query.lower() if search_query else ''
+    
+    def cached_page(self, search_query: Optional[str]):
+        """Get the cached first page and total for a query, if any"""
+        key = self._cache_key(search_query)
+        cached = self._query_cache.get(key)
+        if cached is not None:
+            self._query_cache.move_to_end(key)
+        return cached
+    
+    def show_page(self, search_query: Optional[str], items: tuple, total: int,
+                  generation: Optional[int] = None):
+        """Reset the model to a fetched first page and cache it"""
+        # Pages fetched before the last invalidation are shown but not cached
+        if generation is None or generation == self._cache_generation:
+            self._query_cache[self._cache_key(search_query)] = (items, total)
+            if len(self._query_cache) > self.QUERY_CACHE_SIZE:
+                self._query_cache.popitem(last=False)
+        
+        self._search_query = search_query
+        self._total = total
+        self._has_more = len(items) < total
+        self.set_items(list(items))
+    
+    def load(self, search_query: str = None):
+        """Reset the model to the first page of items matching a query"""
+        search_query = (search_query or '').strip() or None
+        cached = self.cached_page(search_query)
+        if cached is not None:
+            items, total = cached
+        else:
+            items = tuple(self.db_manager.get_items(limit=self.PAGE_SIZE, search_query=search_query))
+            total = self.db_manager.count_items(search_query)
+        self.show_page(search_query, items, total)
+    
+    def invalidate_cache(self):
+        """Forget cached query results after the history changes"""
+        self._query_cache.clear()
+        self._cache_generation += 1
+    
+    @property
+    def cache_generation(self) -> int:
+        """Counter bumped whenever cached results are invalidated"""
+        return self._cache_generation
+    
+    @property
+    def search_query(self) -> Optional[str]:
+        """The query the loaded items were filtered by"""
+        return self._search_query
+    
+    @property
+    def total_count(self) -> int:
+        """Number of items matching the current query"""
+        return self._total
+    
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        """Whether another page may be available"""
+        return not parent.isValid() and self._has_more
+    
+    def fetchMore(self, parent=QModelIndex()):
+        """Append the next page of items"""
+        if parent.isValid() or not self._has_more:
+            return
+        
+        # Paging by key rather than offset keeps pages aligned when items
+        # are added or re-pinned after the first page was loaded
+        items = self.db_manager.get_items(
+            limit=self.PAGE_SIZE, search_query=self._search_query, after=self._page_after
+        )
+        self._has_more = len(items) == self.PAGE_SIZE
+        if items:
+            self._page_after = self._sort_key(items[-1])
+        
+        # An item unpinned after loading sorts below the key again
+        items = [item for item in items if item.id not in self._row_by_id]
+        if items:
+            first = len(self._items)
+            self.beginInsertRows(QModelIndex(), first, first + len(items) - 1)
+            self._items.extend(items)
+            self._row_by_id.update((item.id, first + i) for i, item in enumerate(items))
+            self.endInsertRows()
+    
+    def item_at(self, row: int) -> Optional[ClipboardItem]:
+        """Get the item at a row"""
+        if 0 <= row < len(self._items):
+            return self._items[row]
+        return None
+    
+    def update_item(self, row: int, item: ClipboardItem):
+        """Replace the item at a row and repaint just that row"""
+        self._items[row] = item
+        self._row_by_id[item.id] = row
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+    
+    def remove_item(self, row: int):
+        """Remove the item at a row"""
+        self.beginRemoveRows(QModelIndex(), row, row)
+        item = self._items.pop(row)
+        self._row_by_id.pop(item.id, None)
+        self._reindex(row)
+        self._total -= 1
+        self.endRemoveRows()
+    
+    def _reindex(self, start: int):
+        """Refresh the id index for rows from start onwards"""
+        for row in range(start, len(self._items)):
+            self._row_by_id[self._items[row].id] = row
+    
+    def row_of(self, item_id: int) -> int:
+        """Get the row of an item by id, or -1 if it is not loaded"""
+        return self._row_by_id.get(item_id, -1)
 
 
-class ClipboardItemWidget(QWidget):
-    """Custom widget for displaying clipboard items"""
+class _HistorySignals(QObject):
+    """Delivers history pages loaded on a worker thread to the GUI thread"""
     
-    item_selected = pyqtSignal(ClipboardItem)
-    item_double_clicked = pyqtSignal(ClipboardItem)
-    item_right_clicked = pyqtSignal(ClipboardItem, QPoint)
+    # Load sequence number, cache generation, query, items, total
+    loaded = pyqtSignal(int, int, object, object, int)
+
+
+class LoadHistoryTask(QRunnable):
+    """Query a page of clipboard history on a worker thread"""
     
-    def __init__(self, item: ClipboardItem, theme_manager: ThemeManager):
+    def __init__(self, db_manager: DatabaseManager, signals: _HistorySignals, seq: int,
+                 generation: int, search_query: Optional[str], limit: int):
         super().__init__()
-        self.item = item
+        self.db_manager = db_manager
+        self.signals = signals
+        self.seq = seq
+        self.generation = generation
+        self.search_query = search_query
+        self.limit = limit
+    
+    def run(self):
+        """Fetch the page and its total count"""
+        try:
+            items = tuple(self.db_manager.get_items(limit=self.limit, search_query=self.search_query))
+            total = self.db_manager.count_items(self.search_query)
+        except Exception as e:
+            print(f"Error loading history: {e}")
+            return
+        self.signals.loaded.emit(self.seq, self.generation, self.search_query, items, total)
+
+
+class ClipboardItemDelegate(QStyledItemDelegate):
+    """Paints clipboard items directly instead of building a widget per row"""
+    
+    ROW_HEIGHT = 60
+    
+    # Shared by every delegate; created on first use since fonts and
+    # pixmaps need a running QApplication
+    _text_font = None
+    _rich_font = None
+    _timestamp_font = None
+    _icon_pixmaps: Dict[tuple, QPixmap] = {}
+    
+    def __init__(self, theme_manager: ThemeManager, parent=None):
+        super().__init__(parent)
         self.theme_manager = theme_manager
-        self.is_selected = False
-        self.setup_ui()
-        self.apply_theme()
+        self.flash_row = -1
+        self.colors = {}
+        self.update_theme()
+        self._init_fonts()
     
-    def setup_ui(self):
-        """Setup the UI for this item"""
-        layout = QVBoxLayout()
-        layout.setContentsMargins(6, 6, 6, 6)
-        layout.setSpacing(3)
-        
-        # Main content area
-        content_layout = QHBoxLayout()
-        content_layout.setSpacing(6)
-        
-        # Icon based on content type
-        icon_label = QLabel()
-        icon_label.setFixedSize(20, 20)
-        icon_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        
-        if self.item.content_type == ContentType.TEXT or self.item.content_type == ContentType.RICH_TEXT:
-            icon_label.setText("📝")
-        elif self.item.content_type == ContentType.IMAGE:
-            icon_label.setText("🖼️")
-        elif self.item.content_type == ContentType.FILE:
-            icon_label.setText("📄")
-        elif self.item.content_type == ContentType.FOLDER:
-            icon_label.setText("📁")
-        
-        content_layout.addWidget(icon_label)
-        
-        # Content preview
-        preview_label = QLabel(self.item.preview)
-        preview_label.setWordWrap(True)
-        preview_label.setMaximumHeight(32)
-        preview_label.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Preferred)
-        
-        # Style the preview based on content type
-        if self.item.content_type == ContentType.TEXT:
-            preview_label.setFont(QFont("Consolas", 9))
-        elif self.item.content_type == ContentType.RICH_TEXT:
-            preview_label.setFont(QFont("Arial", 9))
-            preview_label.setStyleSheet("color: #0066cc;")
-        
-        content_layout.addWidget(preview_label)
-        
-        # Pin indicator
-        if self.item.is_pinned:
-            pin_label = QLabel("📌")
-            pin_label.setFixedSize(16, 16)
-            pin_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            content_layout.addWidget(pin_label)
-        
-        layout.addLayout(content_layout)
-        
-        # Timestamp
-        timestamp_label = QLabel(self.item.timestamp.strftime("%H:%M:%S"))
-        timestamp_label.setStyleSheet("color: #666; font-size: 9px;")
-        layout.addWidget(timestamp_label)
-        
-        self.setLayout(layout)
-        self.setFixedHeight(60)  # More compact height
-        self.setMouseTracking(True)
+    @classmethod
+    def _init_fonts(cls):
+        """Create the row fonts once for all delegates"""
+        if cls._text_font is None:
+            cls._text_font = QFont("Consolas", 9)
+            cls._rich_font = QFont("Arial", 9)
+            cls._timestamp_font = QFont()
+            cls._timestamp_font.setPixelSize(9)
     
-    def apply_theme(self):
-        """Apply current theme to this widget"""
+    @classmethod
+    def _icon_pixmap(cls, icon: str, size: int) -> QPixmap:
+        """Render an emoji icon once and reuse the pixmap"""
+        key = (icon, size)
+        pixmap = cls._icon_pixmaps.get(key)
+        if pixmap is None:
+            ratio = QApplication.instance().devicePixelRatio()
+            pixmap = QPixmap(round(size * ratio), round(size * ratio))
+            pixmap.setDevicePixelRatio(ratio)
+            pixmap.fill(Qt.GlobalColor.transparent)
+            icon_painter = QPainter(pixmap)
+            icon_painter.drawText(QRect(0, 0, size, size), Qt.AlignmentFlag.AlignCenter, icon)
+            icon_painter.end()
+            cls._icon_pixmaps[key] = pixmap
+        return pixmap
+    
+    def update_theme(self):
+        """Resolve the current theme's row colors once per theme change"""
         theme = self.theme_manager.current_theme
+        self.colors = {
+            'item_bg': QColor(theme.item_bg),
+            'item_text': QColor(theme.item_text),
+            'selection_bg': QColor(theme.selection_bg),
+            'selection_text': QColor(theme.selection_text),
+            'hover_bg': QColor(theme.hover_bg),
+            'border': QColor(theme.border),
+            'accent': QColor(theme.accent),
+            'rich_text': QColor('#0066cc'),
+            'timestamp': QColor('#666')
+        }
+    
+    def sizeHint(self, option, index) -> QSize:
+        """Every row has the same compact height"""
+        return QSize(option.rect.width(), self.ROW_HEIGHT)
+    
+    def paint(self, painter: QPainter, option, index: QModelIndex):
+        """Paint a single clipboard item"""
+        item = index.data(Qt.ItemDataRole.UserRole)
+        if item is None:
+            return
         
-        if self.is_selected:
-            bg_color = theme.get('selection_bg', '#0078d4')
-            text_color = theme.get('selection_text', '#ffffff')
+        colors = self.colors
+        selected = bool(option.state & QStyle.StateFlag.State_Selected)
+        hovered = bool(option.state & QStyle.StateFlag.State_MouseOver)
+        
+        flashing = index.row() == self.flash_row
+        if flashing:
+            # Brief click feedback
+            bg_color = colors['accent']
+            text_color = colors['selection_text']
+        elif selected:
+            bg_color = colors['selection_bg']
+            text_color = colors['selection_text']
+        elif hovered:
+            bg_color = colors['hover_bg']
+            text_color = colors['item_text']
         else:
-            bg_color = theme.get('item_bg', '#ffffff')
-            text_color = theme.get('item_text', '#000000')
+            bg_color = colors['item_bg']
+            text_color = colors['item_text']
+        border_color = colors['accent'] if hovered or flashing else colors['border']
         
-        self.setStyleSheet(f"""
-            ClipboardItemWidget {{
-                background-color: {bg_color};
-                color: {text_color};
-                border: 1px solid {theme.get('border', '#e0e0e0')};
-                border-radius: 6px;
-                margin: 3px 2px;
-            }}
-            ClipboardItemWidget:hover {{
-                background-color: {theme.get('hover_bg', '#f0f0f0')};
-                border-color: {theme.get('accent', '#0078d4')};
-            }}
-        """)
-    
-    def mousePressEvent(self, event):
-        """Handle mouse press events"""
-        if event.button() == Qt.MouseButton.LeftButton:
-            # Immediate visual feedback
-            self.set_selected(True)
-            # Add a brief visual flash for click feedback
-            self.flash_click_feedback()
-            # Emit signal
-            self.item_selected.emit(self.item)
-        elif event.button() == Qt.MouseButton.RightButton:
-            self.item_right_clicked.emit(self.item, event.globalPosition().toPoint())
-        super().mousePressEvent(event)
-    
-    def mouseDoubleClickEvent(self, event):
-        """Handle double click events"""
-        if event.button() == Qt.MouseButton.LeftButton:
-            self.item_double_clicked.emit(self.item)
-        super().mouseDoubleClickEvent(event)
-    
-    def set_selected(self, selected: bool):
-        """Set selection state"""
-        self.is_selected = selected
-        self.apply_theme()
-    
-    def flash_click_feedback(self):
-        """Provide visual feedback for click"""
-        # Store original style
-        original_style = self.styleSheet()
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         
-        # Create flash effect
-        theme = self.theme_manager.current_theme
-        flash_style = f"""
-            ClipboardItemWidget {{
-                background-color: {theme.get('accent', '#0078d4')};
-                color: {theme.get('selection_text', '#ffffff')};
-                border: 2px solid {theme.get('accent', '#0078d4')};
-                border-radius: 6px;
-                margin: 3px 2px;
-            }}
-        """
+        # Background card
+        rect = option.rect.adjusted(2, 3, -2, -3)
+        painter.setPen(QPen(border_color, 2 if flashing else 1))
+        painter.setBrush(bg_color)
+        painter.drawRoundedRect(rect, 6, 6)
         
-        # Apply flash style
-        self.setStyleSheet(flash_style)
+        content = rect.adjusted(6, 6, -6, -6)
         
-        # Reset after brief delay
-        QTimer.singleShot(150, lambda: self.apply_theme())
-    
-    def enterEvent(self, event):
-        """Handle mouse enter events"""
-        if not self.is_selected:
-            self.apply_theme()
-        super().enterEvent(event)
-    
-    def leaveEvent(self, event):
-        """Handle mouse leave events"""
-        if not self.is_selected:
-            self.apply_theme()
-        super().leaveEvent(event)
+        # Icon based on content type
+        icon = _ICON_FOR.get(item.content_type, "")
+        
+        painter.setPen(text_color)
+        icon_rect = QRect(content.left(), content.top(), 20, 20)
+        if icon:
+            painter.drawPixmap(icon_rect, self._icon_pixmap(icon, 20))
+        
+        # Pin indicator
+        preview_right = content.right()
+        if item.is_pinned:
+            pin_rect = QRect(content.right() - 15, content.top() + 2, 16, 16)
+            painter.drawPixmap(pin_rect, self._icon_pixmap("📌", 16))
+            preview_right = pin_rect.left() - 6
+        
+        # Content preview, styled by content type
+        if item.content_type == ContentType.TEXT:
+            painter.setFont(self._text_font)
+        elif item.content_type == ContentType.RICH_TEXT:
+            painter.setFont(self._rich_font)
+            if not selected:
+                painter.setPen(colors['rich_text'])
+        else:
+            painter.setFont(option.font)
+        preview_rect = QRect(icon_rect.right() + 7, content.top(), preview_right - icon_rect.right() - 7, 20)
+        preview = painter.fontMetrics().elidedText(
+            item.preview, Qt.TextElideMode.ElideRight, preview_rect.width()
+        )
+        painter.drawText(preview_rect, Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft, preview)
+        
+        # Timestamp, formatted directly since strftime is slow per repaint
+        timestamp = item.timestamp
+        painter.setFont(self._timestamp_font)
+        painter.setPen(text_color if selected else colors['timestamp'])
+        timestamp_rect = QRect(content.left(), icon_rect.bottom() + 3, content.width(), content.bottom() - icon_rect.bottom() - 3)
+        painter.drawText(
+            timestamp_rect,
+            Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft,
+            f"{timestamp.hour:02d}:{timestamp.minute:02d}:{timestamp.second:02d}"
+        )
+        
+        painter.restore()
 
 
 class MainWindow(QMainWindow):
@@ -189,10 +410,12 @@ class MainWindow(QMainWindow):
         self.db_manager = db_manager
         self.theme_manager = theme_manager
         self.current_selected_item = None
-        self.item_widgets = []
+        self._load_seq = 0
         
         self.setup_ui()
         self.setup_shortcuts()
+        self.setup_context_menu()
+        self.setup_screen_tracking()
         self.apply_theme()
         self.load_clipboard_history()
         
@@ -221,6 +444,11 @@ class MainWindow(QMainWindow):
         self.search_input.textChanged.connect(self.on_search_text_changed)
         search_layout.addWidget(self.search_input)
         
+        # Click feedback timer, reused for every click
+        self.flash_timer = QTimer()
+        self.flash_timer.setSingleShot(True)
+        self.flash_timer.timeout.connect(self.end_click_feedback)
+        
         # Search debounce timer
         self.search_timer = QTimer()
         self.search_timer.setSingleShot(True)
@@ -234,24 +462,37 @@ class MainWindow(QMainWindow):
         
         main_layout.addLayout(search_layout)
         
-        # History list
-        self.history_scroll = QScrollArea()
-        self.history_scroll.setWidgetResizable(True)
-        self.history_scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        self.history_scroll.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
-        
-        self.history_widget = QWidget()
-        self.history_layout = QVBoxLayout()
-        self.history_layout.setContentsMargins(2, 2, 2, 2)
-        self.history_layout.setSpacing(4)  # Better spacing between items
-        self.history_widget.setLayout(self.history_layout)
-        
-        self.history_scroll.setWidget(self.history_widget)
-        main_layout.addWidget(self.history_scroll)
+        # History list; rows are painted by the delegate, so only the
+        # visible ones cost anything to lay out and draw
+        self.history_model = ClipboardListModel(self.db_manager, self)
+        self._history_signals = _HistorySignals(self)
+        self._history_signals.loaded.connect(self._on_history_loaded)
+        self.history_delegate = ClipboardItemDelegate(self.theme_manager, self)
+        
+        self.history_list = QListView()
+        self.history_list.setModel(self.history_model)
+        self.history_list.setItemDelegate(self.history_delegate)
+        self.history_list.setUniformItemSizes(True)
+        self.history_list.setLayoutMode(QListView.LayoutMode.Batched)
+        self.history_list.setBatchSize(20)
+        self.history_list.setSpacing(1)
+        self.history_list.setMouseTracking(True)
+        self.history_list.setSelectionMode(QListView.SelectionMode.SingleSelection)
+        self.history_list.setEditTriggers(QListView.EditTrigger.NoEditTriggers)
+        self.history_list.setVerticalScrollMode(QListView.ScrollMode.ScrollPerPixel)
+        self.history_list.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.history_list.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
+        self.history_list.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.history_list.selectionModel().currentChanged.connect(self.on_current_changed)
+        self.history_list.doubleClicked.connect(self.paste_selected_item)
+        self.history_list.pressed.connect(self.flash_click_feedback)
+        self.history_list.customContextMenuRequested.connect(self.on_context_menu_requested)
+        self.history_list.verticalScrollBar().valueChanged.connect(self.on_history_scrolled)
+        main_layout.addWidget(self.history_list)
         
         # Status bar
         self.status_label = QLabel("Ready")
-        self.status_label.setStyleSheet("color: #666; font-size: 10px;")
+        self.status_label.setObjectName("statusLabel")
         main_layout.addWidget(self.status_label)
         
         central_widget.setLayout(main_layout)
@@ -289,62 +530,97 @@ class MainWindow(QMainWindow):
         """Apply current theme to the window"""
         theme = self.theme_manager.current_theme
         
+        # Restyle everything in one pass and repaint once at the end
+        self.setUpdatesEnabled(False)
         self.setStyleSheet(f"""
             QMainWindow {{
-                background-color: {theme.get('window_bg', '#ffffff')};
-                color: {theme.get('window_text', '#000000')};
+                background-color: {theme.window_bg};
+                color: {theme.window_text};
             }}
             QLineEdit {{
-                background-color: {theme.get('input_bg', '#ffffff')};
-                color: {theme.get('input_text', '#000000')};
-                border: 2px solid {theme.get('input_border', '#e0e0e0')};
+                background-color: {theme.input_bg};
+                color: {theme.input_text};
+                border: 2px solid {theme.input_border};
                 border-radius: 6px;
                 padding: 8px;
                 font-size: 12px;
             }}
             QLineEdit:focus {{
-                border-color: {theme.get('accent', '#0078d4')};
+                border-color: {theme.accent};
             }}
             QPushButton {{
-                background-color: {theme.get('button_bg', '#f0f0f0')};
-                color: {theme.get('button_text', '#000000')};
-                border: 1px solid {theme.get('button_border', '#d0d0d0')};
+                background-color: {theme.button_bg};
+                color: {theme.button_text};
+                border: 1px solid {theme.button_border};
                 border-radius: 4px;
                 padding: 4px;
             }}
             QPushButton:hover {{
-                background-color: {theme.get('button_hover', '#e0e0e0')};
+                background-color: {theme.button_hover};
             }}
-            QScrollArea {{
-                border: 1px solid {theme.get('border', '#e0e0e0')};
+            QListView {{
+                border: 1px solid {theme.border};
                 border-radius: 4px;
-                background-color: {theme.get('scroll_bg', '#ffffff')};
+                background-color: {theme.scroll_bg};
+            }}
+            QLabel#statusLabel {{
+                color: #666;
+                font-size: 10px;
             }}
         """)
+        
+        # Rows are painted by the delegate rather than styled per widget
+        self.history_delegate.update_theme()
+        self.setUpdatesEnabled(True)
+        self.history_list.viewport().update()
     
     def load_clipboard_history(self, search_query: str = None):
         """Load clipboard history from database"""
-        # Clear existing widgets more efficiently
-        for widget in self.item_widgets:
-            widget.setParent(None)
-            widget.deleteLater()
-        self.item_widgets.clear()
-        
-        # Get items from database (reduced limit for better performance)
-        items = self.db_manager.get_items(limit=50, search_query=search_query)
-        
-        # Create widgets for each item
-        for item in items:
-            widget = ClipboardItemWidget(item, self.theme_manager)
-            widget.item_selected.connect(self.on_item_selected)
-            widget.item_double_clicked.connect(self.paste_selected_item)
-            widget.item_right_clicked.connect(self.show_item_context_menu)
-            
-            self.history_layout.addWidget(widget)
-            self.item_widgets.append(widget)
+        # Supersede any search still running in the background
+        self._load_seq += 1
+        
+        # Only the first page is fetched; more rows load as the list scrolls
+        self._reset_history(self.history_model.load, search_query)
         
         # Update status
-        self.status_label.setText(f"Loaded {len(items)} items")
+        self.status_label.setText(f"Loaded {self.history_model.total_count} items")
+    
+    def _on_history_loaded(self, seq: int, generation: int, search_query: Optional[str],
+                           items: tuple, total: int):
+        """Show a page loaded in the background unless a newer load started"""
+        if seq != self._load_seq:
+            return
+        
+        self._reset_history(self.history_model.show_page, search_query, items, total, generation)
+        
+        self.status_label.setText(f"Loaded {total} items")
+    
+    def _reset_history(self, reset, *args):
+        """Reset the history model and restore the selection in one batch"""
+        # The reset and reselection repaint the list once, not per step.
+        # Selection signals are held back too: the restored selection is
+        # already the current item, so there is nothing for slots to do
+        selection_model = self.history_list.selectionModel()
+        self.history_list.setUpdatesEnabled(False)
+        selection_model.blockSignals(True)
+        try:
+            reset(*args)
+            self._restore_selection()
+        finally:
+            selection_model.blockSignals(False)
+            self.history_list.setUpdatesEnabled(True)
+        self.history_list.viewport().update()
+    
+    def _restore_selection(self):
+        """Keep the previous selection if the item is still listed"""
+        if self.current_selected_item:
+            row = self.history_model.row_of(self.current_selected_item.id)
+            if row >= 0:
+                self.history_list.setCurrentIndex(self.history_model.index(row))
+    
+    def invalidate_cache(self):
+        """Drop cached search results so the next load reads the database"""
+        self.history_model.invalidate_cache()
     
     def on_search_text_changed(self, text: str):
         """Handle search text changes with debouncing"""
@@ -355,24 +631,65 @@ class MainWindow(QMainWindow):
     
     def filter_history(self):
         """Filter history based on current search query"""
-        query = self.search_input.text().strip() if self.search_input.text() else None
-        self.load_clipboard_history(query)
+        query = self.search_input.text().strip() or None
+        # Whatever happens below, a search still running for an earlier
+        # query must not replace the results
+        self._load_seq += 1
+        
+        # Keep the loaded pages and scroll position if the query didn't change
+        if query == self.history_model.search_query and self.history_model.rowCount():
+            return
+        
+        # Cached results are shown immediately; anything else is queried
+        # off the GUI thread
+        if self.history_model.cached_page(query) is not None:
+            self.load_clipboard_history(query)
+            return
+        
+        task = LoadHistoryTask(
+            self.db_manager, self._history_signals, self._load_seq,
+            self.history_model.cache_generation, query, ClipboardListModel.PAGE_SIZE
+        )
+        QThreadPool.globalInstance().start(task)
+    
+    def on_history_scrolled(self, value: int):
+        """Fetch the next page when the list is scrolled near its end"""
+        scroll_bar = self.history_list.verticalScrollBar()
+        row_span = ClipboardItemDelegate.ROW_HEIGHT * 5
+        if scroll_bar.maximum() - value <= row_span and self.history_model.canFetchMore():
+            self.history_model.fetchMore()
+    
+    def flash_click_feedback(self, index: QModelIndex):
+        """Briefly highlight a clicked row"""
+        if QApplication.mouseButtons() != Qt.MouseButton.LeftButton:
+            return
+        self.history_delegate.flash_row = index.row()
+        self.history_list.viewport().update()
+        self.flash_timer.start(150)
+    
+    def end_click_feedback(self):
+        """Clear the click highlight"""
+        self.history_delegate.flash_row = -1
+        self.history_list.viewport().update()
+    
+    def on_current_changed(self, current: QModelIndex, previous: QModelIndex):
+        """Track the item under the view's current index"""
+        item = self.history_model.item_at(current.row())
+        if item:
+            self.current_selected_item = item
     
     def on_item_selected(self, item: ClipboardItem):
         """Handle item selection"""
-        # Deselect previous item
-        if self.current_selected_item:
-            for widget in self.item_widgets:
-                if widget.item.id == self.current_selected_item.id:
-                    widget.set_selected(False)
-                    break
-        
-        # Select new item
         self.current_selected_item = item
-        for widget in self.item_widgets:
-            if widget.item.id == item.id:
-                widget.set_selected(True)
-                break
+        row = self.history_model.row_of(item.id)
+        if row >= 0:
+            self.history_list.setCurrentIndex(self.history_model.index(row))
+    
+    def on_context_menu_requested(self, position: QPoint):
+        """Show the context menu for the item under the cursor"""
+        item = self.history_model.item_at(self.history_list.indexAt(position).row())
+        if item:
+            self.show_item_context_menu(item, self.history_list.viewport().mapToGlobal(position))
     
     def paste_selected_item(self):
         """Paste the selected item"""
@@ -380,9 +697,8 @@ class MainWindow(QMainWindow):
             return
         
         try:
-            self.copy_item_to_clipboard(self.current_selected_item)
             self.hide()
-            self.simulate_paste()
+            paste_item(self.current_selected_item)
             self.status_label.setText("Item pasted successfully")
         except Exception as e:
             self.status_label.setText(f"Error pasting item: {str(e)}")
@@ -395,101 +711,82 @@ class MainWindow(QMainWindow):
         try:
             # Convert to plain text if it's rich text
             if self.current_selected_item.content_type == ContentType.RICH_TEXT:
-                import re
-                plain_text = re.sub(r'<[^>]+>', '', self.current_selected_item.content)
+                plain_text = _HTML_TAG_RE.sub('', self.current_selected_item.content)
                 clipboard = QApplication.clipboard()
                 clipboard.setText(plain_text)
+                self.hide()
+                simulate_paste()
             else:
-                self.copy_item_to_clipboard(self.current_selected_item)
-            
-            self.hide()
-            self.simulate_paste()
+                # Images are decoded in the background, so paste once the
+                # clipboard has been set
+                self.hide()
+                copy_item_to_clipboard(self.current_selected_item, simulate_paste)
             self.status_label.setText("Item pasted as plain text")
         except Exception as e:
             self.status_label.setText(f"Error pasting item: {str(e)}")
     
-    def copy_item_to_clipboard(self, item: ClipboardItem):
-        """Copy item content to system clipboard"""
-        clipboard = QApplication.clipboard()
-        
-        if item.content_type == ContentType.TEXT or item.content_type == ContentType.RICH_TEXT:
-            clipboard.setText(item.content)
-        elif item.content_type == ContentType.IMAGE:
-            # Convert base64 back to image
-            image_data = base64.b64decode(item.content)
-            image = Image.open(io.BytesIO(image_data))
-            # Convert PIL image to QPixmap
-            from PyQt6.QtGui import QImage
-            # Convert PIL image to RGBA if needed
-            if image.mode != 'RGBA':
-                image = image.convert('RGBA')
-            qimage = QImage(image.tobytes(), image.size[0], image.size[1], QImage.Format.Format_RGBA8888)
-            pixmap = QPixmap.fromImage(qimage)
-            clipboard.setPixmap(pixmap)
-        elif item.content_type in [ContentType.FILE, ContentType.FOLDER]:
-            # For files, we can't directly set file paths to clipboard
-            # Instead, copy the path as text
-            clipboard.setText(item.content)
-    
-    def simulate_paste(self):
-        """Simulate Ctrl+V keypress to paste"""
-        import keyboard
-        keyboard.send('ctrl+v')
-    
     def select_all_items(self):
         """Select all visible items"""
-        if self.item_widgets:
-            self.on_item_selected(self.item_widgets[0].item)
+        item = self.history_model.item_at(0)
+        if item:
+            self.on_item_selected(item)
     
-    def show_item_context_menu(self, item: ClipboardItem, position: QPoint):
-        """Show context menu for an item"""
-        menu = QMenu(self)
+    def setup_context_menu(self):
+        """Build the item context menu once; it is retargeted on each open"""
+        self._context_item = None
+        self._context_menu = QMenu(self)
         
         # Pin/Unpin action
-        if item.is_pinned:
-            pin_action = QAction("Unpin Item", self)
-            pin_action.triggered.connect(lambda: self.toggle_pin_item(item))
-        else:
-            pin_action = QAction("Pin Item", self)
-            pin_action.triggered.connect(lambda: self.toggle_pin_item(item))
-        menu.addAction(pin_action)
+        self._pin_action = QAction("Pin Item", self)
+        self._pin_action.triggered.connect(partial(self._on_context_action, self.toggle_pin_item))
+        self._context_menu.addAction(self._pin_action)
         
         # Copy action
         copy_action = QAction("Copy to Clipboard", self)
-        copy_action.triggered.connect(lambda: self.copy_item_to_clipboard(item))
-        menu.addAction(copy_action)
+        copy_action.triggered.connect(partial(self._on_context_action, copy_item_to_clipboard))
+        self._context_menu.addAction(copy_action)
         
         # Text transformation actions
-        if item.content_type in [ContentType.TEXT, ContentType.RICH_TEXT]:
-            menu.addSeparator()
-            
-            transform_menu = QMenu("Transform Text", self)
-            
-            uppercase_action = QAction("UPPERCASE", self)
-            uppercase_action.triggered.connect(lambda: self.transform_text(item, 'uppercase'))
-            transform_menu.addAction(uppercase_action)
-            
-            lowercase_action = QAction("lowercase", self)
-            lowercase_action.triggered.connect(lambda: self.transform_text(item, 'lowercase'))
-            transform_menu.addAction(lowercase_action)
-            
-            titlecase_action = QAction("Title Case", self)
-            titlecase_action.triggered.connect(lambda: self.transform_text(item, 'titlecase'))
-            transform_menu.addAction(titlecase_action)
-            
-            trim_action = QAction("Trim Whitespace", self)
-            trim_action.triggered.connect(lambda: self.transform_text(item, 'trim'))
-            transform_menu.addAction(trim_action)
-            
-            menu.addMenu(transform_menu)
+        self._transform_separator = self._context_menu.addSeparator()
+        
+        self._transform_menu = QMenu("Transform Text", self)
+        for label, transform_type in (
+            ("UPPERCASE", 'uppercase'),
+            ("lowercase", 'lowercase'),
+            ("Title Case", 'titlecase'),
+            ("Trim Whitespace", 'trim')
+        ):
+            action = QAction(label, self)
+            action.triggered.connect(partial(self._on_context_transform, transform_type))
+            self._transform_menu.addAction(action)
+        self._context_menu.addMenu(self._transform_menu)
         
         # Delete action
-        menu.addSeparator()
+        self._context_menu.addSeparator()
         delete_action = QAction("Delete Item", self)
-        delete_action.triggered.connect(lambda: self.delete_item(item))
-        menu.addAction(delete_action)
+        delete_action.triggered.connect(partial(self._on_context_action, self.delete_item))
+        self._context_menu.addAction(delete_action)
+    
+    def show_item_context_menu(self, item: ClipboardItem, position: QPoint):
+        """Show context menu for an item"""
+        self._context_item = item
+        self._pin_action.setText("Unpin Item" if item.is_pinned else "Pin Item")
         
-        menu.exec(position)
+        is_text = item.content_type in [ContentType.TEXT, ContentType.RICH_TEXT]
+        self._transform_separator.setVisible(is_text)
+        self._transform_menu.menuAction().setVisible(is_text)
+        
+        self._context_menu.exec(position)
+    
+    def _on_context_action(self, handler, checked: bool = False):
+        """Run a context menu handler on the item the menu was opened for"""
+        if self._context_item:
+            handler(self._context_item)
+    
+    def _on_context_transform(self, transform_type: str, checked: bool = False):
+        """Apply a text transform to the item the menu was opened for"""
+        if self._context_item:
+            self.transform_text(self._context_item, transform_type)
     
     def toggle_pin_item(self, item: ClipboardItem):
         """Toggle pin status of an item"""
@@ -497,8 +794,11 @@ class MainWindow(QMainWindow):
         self.db_manager.pin_item(item.id, new_pinned)
         item.is_pinned = new_pinned
         
-        # Refresh the display
-        self.load_clipboard_history(self.search_input.text())
+        # Repaint only the affected row; the new order applies on next load
+        self.invalidate_cache()
+        row = self.history_model.row_of(item.id)
+        if row >= 0:
+            self.history_model.update_item(row, item)
         self.status_label.setText(f"Item {'pinned' if new_pinned else 'unpinned'}")
     
     def transform_text(self, item: ClipboardItem, transform_type: str):
@@ -507,49 +807,37 @@ class MainWindow(QMainWindow):
             return
         
         original_text = item.content
-        transformed_text = original_text
-        
-        if transform_type == 'uppercase':
-            transformed_text = original_text.upper()
-        elif transform_type == 'lowercase':
-            transformed_text = original_text.lower()
-        elif transform_type == 'titlecase':
-            transformed_text = original_text.title()
-        elif transform_type == 'trim':
-            transformed_text = original_text.strip()
+        transform = _TRANSFORMS.get(transform_type)
+        transformed_text = transform(original_text) if transform else original_text
         
         if transformed_text != original_text:
             # Update the item in database
             item.content = transformed_text
             item.preview = self._create_text_preview(transformed_text)
+            self.db_manager.update_item(item.id, item.content, item.preview)
+            self.invalidate_cache()
             
-            # Save to database (we need to add an update method to DatabaseManager)
-            # For now, we'll create a new item
-            new_item = ClipboardItem(
-                id=None,
-                content=transformed_text,
-                content_type=item.content_type,
-                preview=item.preview,
-                timestamp=item.timestamp,
-                is_pinned=item.is_pinned,
-                metadata=item.metadata
-            )
-            
-            self.db_manager.add_item(new_item)
-            self.load_clipboard_history(self.search_input.text())
+            # Repaint only the transformed row
+            row = self.history_model.row_of(item.id)
+            if row >= 0:
+                self.history_model.update_item(row, item)
             self.status_label.setText("Text transformed and saved")
     
     def delete_item(self, item: ClipboardItem):
         """Delete an item"""
         self.db_manager.delete_item(item.id)
-        self.load_clipboard_history(self.search_input.text())
+        self.invalidate_cache()
+        
+        row = self.history_model.row_of(item.id)
+        if row >= 0:
+            self.history_model.remove_item(row)
+        if self.current_selected_item and self.current_selected_item.id == item.id:
+            self.current_selected_item = None
         self.status_label.setText("Item deleted")
     
     def _create_text_preview(self, text: str, max_length: int = 100) -> str:
         """Create a preview of text content"""
-        import re
-        clean_text = re.sub(r'<[^>]+>', '', text)
-        clean_text = clean_text.replace('\n', ' ').replace('\r', ' ')
+        clean_text = _HTML_TAG_RE.sub('', text).translate(_NEWLINE_TRANS)
         
         if len(clean_text) > max_length:
             return clean_text[:max_length] + "..."
@@ -560,11 +848,31 @@ class MainWindow(QMainWindow):
         # This will be implemented in the settings module
         pass
     
+    def setup_screen_tracking(self):
+        """Cache the screen geometry and refresh it when screens change"""
+        self._tracked_screen = None
+        self._screen_geometry = QRect()
+        app = QGuiApplication.instance()
+        app.screenAdded.connect(self.update_screen_geometry)
+        app.screenRemoved.connect(self.update_screen_geometry)
+        app.primaryScreenChanged.connect(self.update_screen_geometry)
+        self.update_screen_geometry()
+    
+    def update_screen_geometry(self, *args):
+        """Read the primary screen's available geometry"""
+        screen = QGuiApplication.primaryScreen()
+        if screen is None:
+            return
+        
+        # Track the primary screen's own geometry changes too
+        if self._tracked_screen is not screen:
+            screen.availableGeometryChanged.connect(self.update_screen_geometry)
+            self._tracked_screen = screen
+        self._screen_geometry = screen.availableGeometry()
+    
     def position_near_middle_right(self):
         """Position the window near the middle-right of the screen"""
-        from PyQt6.QtGui import QGuiApplication
-        screen = QGuiApplication.primaryScreen()
-        screen_geometry = screen.availableGeometry()
+        screen_geometry = self._screen_geometry
         
         # Position in the middle-right area
         x = screen_geometry.width() - self.width() - 50  # 50px from right edge
@@ -5,25 +5,83 @@ Settings dialog for PastePal
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, 
     QPushButton, QCheckBox, QSpinBox, QLineEdit, QGroupBox,
-    QFormLayout, QDialogButtonBox, QTabWidget, QWidget
+    QFormLayout, QDialogButtonBox, QTabWidget, QWidget, QMessageBox
 )
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
 from PyQt6.QtGui import QFont
+from typing import Dict
 from .themes import ThemeManager
 from ..database import DatabaseManager
 
 
+# Settings shown on each dialog tab, with their defaults
+_GENERAL_DEFAULTS = {
+    'start_minimized': 'true',
+    'start_with_windows': 'false',
+    'max_history': '1000',
+    'auto_clear': 'true',
+    'clear_on_exit': 'false',
+    'monitor_enabled': 'true',
+    'monitor_interval': '500'
+}
+
+_APPEARANCE_DEFAULTS = {
+    'theme': 'light',
+    'window_width': '600',
+    'window_height': '500',
+    'always_on_top': 'true',
+    'show_preview': 'true',
+    'preview_length': '100',
+    'show_timestamps': 'true'
+}
+
+_HOTKEY_DEFAULTS = {
+    'hotkey': 'alt+v',
+    'paste_hotkey': 'ctrl+shift+enter',
+    'quick_paste_hotkey': 'ctrl+alt+v'
+}
+
+_ADVANCED_DEFAULTS = {
+    'enable_caching': 'true',
+    'cache_size': '100',
+    'enable_logging': 'false',
+    'log_level': 'INFO'
+}
+
+_LOG_LEVELS = ["DEBUG", "INFO", "WARNING", "ERROR"]
+
+# Stored spellings of boolean settings
+_BOOL_STR = {True: 'true', False: 'false'}
+_BOOL_STR_IN = {'true', '1', 'yes'}
+
+
 class SettingsDialog(QDialog):
     """Settings dialog window"""
     
     settings_changed = pyqtSignal()
+    history_cleared = pyqtSignal()
     
     def __init__(self, db_manager: DatabaseManager, theme_manager: ThemeManager, parent=None):
         super().__init__(parent)
         self.db_manager = db_manager
         self.theme_manager = theme_manager
+        
+        # Tabs are built and loaded on first visit
+        self._tabs = [
+            ("General", self.create_general_tab, self._load_general_settings, self._apply_general_settings),
+            ("Appearance", self.create_appearance_tab, self._load_appearance_settings, self._apply_appearance_settings),
+            ("Hotkeys", self.create_hotkeys_tab, self._load_hotkey_settings, self._apply_hotkey_settings),
+            ("Advanced", self.create_advanced_tab, self._load_advanced_settings, self._apply_advanced_settings)
+        ]
+        self._built_tabs = set()
+        self._last_qss = None
+        self._pending_qss = None
+        
         self.setup_ui()
-        self.load_settings()
+        # The first tab's values are read on the next event-loop pass, so
+        # the dialog can paint before touching the database
+        self._ensure_tab(0, load=False)
+        QTimer.singleShot(0, self.load_settings)
         self.apply_theme()
         
         # Connect theme changes
@@ -38,26 +96,19 @@ class SettingsDialog(QDialog):
         # Main layout
         main_layout = QVBoxLayout()
         
-        # Tab widget
-        tab_widget = QTabWidget()
-        
-        # General tab
-        general_tab = self.create_general_tab()
-        tab_widget.addTab(general_tab, "General")
-        
-        # Appearance tab
-        appearance_tab = self.create_appearance_tab()
-        tab_widget.addTab(appearance_tab, "Appearance")
+        # Tab widget, with empty pages that are filled on first visit
+        self.tab_widget = QTabWidget()
+        self._tab_pages = []
+        for label, _, _, _ in self._tabs:
+            page = QWidget()
+            page_layout = QVBoxLayout()
+            page_layout.setContentsMargins(0, 0, 0, 0)
+            page.setLayout(page_layout)
+            self.tab_widget.addTab(page, label)
+            self._tab_pages.append(page)
+        self.tab_widget.currentChanged.connect(self._ensure_tab)
         
-        # Hotkeys tab
-        hotkeys_tab = self.create_hotkeys_tab()
-        tab_widget.addTab(hotkeys_tab, "Hotkeys")
-        
-        # Advanced tab
-        advanced_tab = self.create_advanced_tab()
-        tab_widget.addTab(advanced_tab, "Advanced")
-        
-        main_layout.addWidget(tab_widget)
+        main_layout.addWidget(self.tab_widget)
         
         # Buttons
         button_box = QDialogButtonBox(
@@ -72,6 +123,17 @@ class SettingsDialog(QDialog):
         main_layout.addWidget(button_box)
         self.setLayout(main_layout)
     
+    def _ensure_tab(self, index: int, load: bool = True):
+        """Build and load a tab the first time it is shown"""
+        if index < 0 or index in self._built_tabs:
+            return
+        self._built_tabs.add(index)
+        
+        _, build, loader, _ = self._tabs[index]
+        self._tab_pages[index].layout().addWidget(build())
+        if load:
+            loader()
+    
     def create_general_tab(self) -> QWidget:
         """Create the general settings tab"""
         widget = QWidget()
@@ -140,6 +202,8 @@ class SettingsDialog(QDialog):
         theme_names = self.theme_manager.get_theme_names()
         for key, name in theme_names.items():
             self.theme_combo.addItem(name, key)
+        # Combo row of each theme key, for restoring the stored selection
+        self._theme_index = {key: i for i, key in enumerate(theme_names)}
         theme_layout.addRow("Theme:", self.theme_combo)
         
         theme_group.setLayout(theme_layout)
@@ -277,7 +341,8 @@ class SettingsDialog(QDialog):
         debug_layout.addRow(self.enable_logging_cb)
         
         self.log_level_combo = QComboBox()
-        self.log_level_combo.addItems(["DEBUG", "INFO", "WARNING", "ERROR"])
+        self.log_level_combo.addItems(_LOG_LEVELS)
+        self._log_index = {level: i for i, level in enumerate(_LOG_LEVELS)}
         debug_layout.addRow("Log level:", self.log_level_combo)
         
         debug_group.setLayout(debug_layout)
@@ -288,123 +353,124 @@ class SettingsDialog(QDialog):
         return widget
     
     def load_settings(self):
-        """Load settings from database"""
-        # General settings
-        self.start_minimized_cb.setChecked(
-            self.db_manager.get_setting('start_minimized', 'true') == 'true'
-        )
-        self.start_with_windows_cb.setChecked(
-            self.db_manager.get_setting('start_with_windows', 'false') == 'true'
-        )
-        self.max_history_spin.setValue(
-            int(self.db_manager.get_setting('max_history', '1000'))
-        )
-        self.auto_clear_cb.setChecked(
-            self.db_manager.get_setting('auto_clear', 'true') == 'true'
-        )
-        self.clear_on_exit_cb.setChecked(
-            self.db_manager.get_setting('clear_on_exit', 'false') == 'true'
-        )
-        self.monitor_enabled_cb.setChecked(
-            self.db_manager.get_setting('monitor_enabled', 'true') == 'true'
-        )
-        self.monitor_interval_spin.setValue(
-            int(self.db_manager.get_setting('monitor_interval', '500'))
-        )
-        
-        # Appearance settings
-        current_theme = self.db_manager.get_setting('theme', 'light')
-        theme_index = self.theme_combo.findData(current_theme)
+        """Load settings from database into the tabs built so far"""
+        for index in sorted(self._built_tabs):
+            self._tabs[index][2]()
+    
+    def _load_general_settings(self):
+        """Load the general tab's settings"""
+        values = self.db_manager.get_settings_bulk(_GENERAL_DEFAULTS)
+        self.start_minimized_cb.setChecked(values['start_minimized'] in _BOOL_STR_IN)
+        self.start_with_windows_cb.setChecked(values['start_with_windows'] in _BOOL_STR_IN)
+        self.max_history_spin.setValue(int(values['max_history']))
+        self.auto_clear_cb.setChecked(values['auto_clear'] in _BOOL_STR_IN)
+        self.clear_on_exit_cb.setChecked(values['clear_on_exit'] in _BOOL_STR_IN)
+        self.monitor_enabled_cb.setChecked(values['monitor_enabled'] in _BOOL_STR_IN)
+        self.monitor_interval_spin.setValue(int(values['monitor_interval']))
+    
+    def _load_appearance_settings(self):
+        """Load the appearance tab's settings"""
+        values = self.db_manager.get_settings_bulk(_APPEARANCE_DEFAULTS)
+        current_theme = values['theme']
+        theme_index = self._theme_index.get(current_theme, -1)
         if theme_index >= 0:
             self.theme_combo.setCurrentIndex(theme_index)
         
-        self.window_width_spin.setValue(
-            int(self.db_manager.get_setting('window_width', '600'))
-        )
-        self.window_height_spin.setValue(
-            int(self.db_manager.get_setting('window_height', '500'))
-        )
-        self.always_on_top_cb.setChecked(
-            self.db_manager.get_setting('always_on_top', 'true') == 'true'
-        )
-        self.show_preview_cb.setChecked(
-            self.db_manager.get_setting('show_preview', 'true') == 'true'
-        )
-        self.preview_length_spin.setValue(
-            int(self.db_manager.get_setting('preview_length', '100'))
-        )
-        self.show_timestamps_cb.setChecked(
-            self.db_manager.get_setting('show_timestamps', 'true') == 'true'
-        )
-        
-        # Hotkey settings
-        self.show_hotkey_edit.setText(
-            self.db_manager.get_setting('hotkey', 'alt+v')
-        )
-        self.paste_hotkey_edit.setText(
-            self.db_manager.get_setting('paste_hotkey', 'ctrl+shift+enter')
-        )
-        self.quick_paste_hotkey_edit.setText(
-            self.db_manager.get_setting('quick_paste_hotkey', 'ctrl+alt+v')
-        )
-        
-        # Advanced settings
+        self.window_width_spin.setValue(int(values['window_width']))
+        self.window_height_spin.setValue(int(values['window_height']))
+        self.always_on_top_cb.setChecked(values['always_on_top'] in _BOOL_STR_IN)
+        self.show_preview_cb.setChecked(values['show_preview'] in _BOOL_STR_IN)
+        self.preview_length_spin.setValue(int(values['preview_length']))
+        self.show_timestamps_cb.setChecked(values['show_timestamps'] in _BOOL_STR_IN)
+    
+    def _load_hotkey_settings(self):
+        """Load the hotkeys tab's settings"""
+        values = self.db_manager.get_settings_bulk(_HOTKEY_DEFAULTS)
+        self.show_hotkey_edit.setText(values['hotkey'])
+        self.paste_hotkey_edit.setText(values['paste_hotkey'])
+        self.quick_paste_hotkey_edit.setText(values['quick_paste_hotkey'])
+    
+    def _load_advanced_settings(self):
+        """Load the advanced tab's settings"""
+        values = self.db_manager.get_settings_bulk(_ADVANCED_DEFAULTS)
         self.db_path_edit.setText(self.db_manager.db_path)
-        self.enable_caching_cb.setChecked(
-            self.db_manager.get_setting('enable_caching', 'true') == 'true'
-        )
-        self.cache_size_spin.setValue(
-            int(self.db_manager.get_setting('cache_size', '100'))
-        )
-        self.enable_logging_cb.setChecked(
-            self.db_manager.get_setting('enable_logging', 'false') == 'true'
-        )
+        self.enable_caching_cb.setChecked(values['enable_caching'] in _BOOL_STR_IN)
+        self.cache_size_spin.setValue(int(values['cache_size']))
+        self.enable_logging_cb.setChecked(values['enable_logging'] in _BOOL_STR_IN)
         
-        log_level = self.db_manager.get_setting('log_level', 'INFO')
-        log_index = self.log_level_combo.findText(log_level)
+        log_level = values['log_level']
+        log_index = self._log_index.get(log_level, -1)
         if log_index >= 0:
             self.log_level_combo.setCurrentIndex(log_index)
     
     def apply_settings(self):
         """Apply current settings to database"""
-        # General settings
-        self.db_manager.set_setting('start_minimized', str(self.start_minimized_cb.isChecked()).lower())
-        self.db_manager.set_setting('start_with_windows', str(self.start_with_windows_cb.isChecked()).lower())
-        self.db_manager.set_setting('max_history', str(self.max_history_spin.value()))
-        self.db_manager.set_setting('auto_clear', str(self.auto_clear_cb.isChecked()).lower())
-        self.db_manager.set_setting('clear_on_exit', str(self.clear_on_exit_cb.isChecked()).lower())
-        self.db_manager.set_setting('monitor_enabled', str(self.monitor_enabled_cb.isChecked()).lower())
-        self.db_manager.set_setting('monitor_interval', str(self.monitor_interval_spin.value()))
-        
-        # Appearance settings
+        # Hold back theme_changed while saving and emit it once at the end,
+        # only if the theme actually changed
+        old_theme = self.theme_manager.current_theme_name
+        updates = {}
+        self.theme_manager.blockSignals(True)
+        try:
+            # Tabs that were never opened still hold the stored values
+            for index in sorted(self._built_tabs):
+                updates.update(self._tabs[index][3]())
+        finally:
+            self.theme_manager.blockSignals(False)
+        
+        # One transaction for every changed setting
+        self.db_manager.set_settings_bulk(updates)
+        
+        if self.theme_manager.current_theme_name != old_theme:
+            self.theme_manager.theme_changed.emit()
+        
+        self.settings_changed.emit()
+    
+    def _apply_general_settings(self) -> Dict[str, str]:
+        """Collect the general tab's settings"""
+        return {
+            'start_minimized': _BOOL_STR[self.start_minimized_cb.isChecked()],
+            'start_with_windows': _BOOL_STR[self.start_with_windows_cb.isChecked()],
+            'max_history': str(self.max_history_spin.value()),
+            'auto_clear': _BOOL_STR[self.auto_clear_cb.isChecked()],
+            'clear_on_exit': _BOOL_STR[self.clear_on_exit_cb.isChecked()],
+            'monitor_enabled': _BOOL_STR[self.monitor_enabled_cb.isChecked()],
+            'monitor_interval': str(self.monitor_interval_spin.value())
+        }
+    
+    def _apply_appearance_settings(self) -> Dict[str, str]:
+        """Collect the appearance tab's settings and apply the theme"""
         current_theme = self.theme_combo.currentData()
-        self.db_manager.set_setting('theme', current_theme)
         self.theme_manager.set_theme(current_theme)
         
-        self.db_manager.set_setting('window_width', str(self.window_width_spin.value()))
-        self.db_manager.set_setting('window_height', str(self.window_height_spin.value()))
-        self.db_manager.set_setting('always_on_top', str(self.always_on_top_cb.isChecked()).lower())
-        self.db_manager.set_setting('show_preview', str(self.show_preview_cb.isChecked()).lower())
-        self.db_manager.set_setting('preview_length', str(self.preview_length_spin.value()))
-        self.db_manager.set_setting('show_timestamps', str(self.show_timestamps_cb.isChecked()).lower())
-        
-        # Hotkey settings
-        self.db_manager.set_setting('hotkey', self.show_hotkey_edit.text().lower())
-        self.db_manager.set_setting('paste_hotkey', self.paste_hotkey_edit.text().lower())
-        self.db_manager.set_setting('quick_paste_hotkey', self.quick_paste_hotkey_edit.text().lower())
-        
-        # Advanced settings
-        self.db_manager.set_setting('enable_caching', str(self.enable_caching_cb.isChecked()).lower())
-        self.db_manager.set_setting('cache_size', str(self.cache_size_spin.value()))
-        self.db_manager.set_setting('enable_logging', str(self.enable_logging_cb.isChecked()).lower())
-        self.db_manager.set_setting('log_level', self.log_level_combo.currentText())
-        
-        self.settings_changed.emit()
+        return {
+            'theme': current_theme,
+            'window_width': str(self.window_width_spin.value()),
+            'window_height': str(self.window_height_spin.value()),
+            'always_on_top': _BOOL_STR[self.always_on_top_cb.isChecked()],
+            'show_preview': _BOOL_STR[self.show_preview_cb.isChecked()],
+            'preview_length': str(self.preview_length_spin.value()),
+            'show_timestamps': _BOOL_STR[self.show_timestamps_cb.isChecked()]
+        }
+    
+    def _apply_hotkey_settings(self) -> Dict[str, str]:
+        """Collect the hotkeys tab's settings"""
+        return {
+            'hotkey': self.show_hotkey_edit.text().lower(),
+            'paste_hotkey': self.paste_hotkey_edit.text().lower(),
+            'quick_paste_hotkey': self.quick_paste_hotkey_edit.text().lower()
+        }
+    
+    def _apply_advanced_settings(self) -> Dict[str, str]:
+        """Collect the advanced tab's settings"""
+        return {
+            'enable_caching': _BOOL_STR[self.enable_caching_cb.isChecked()],
+            'cache_size': str(self.cache_size_spin.value()),
+            'enable_logging': _BOOL_STR[self.enable_logging_cb.isChecked()],
+            'log_level': self.log_level_combo.currentText()
+        }
     
     def clear_database(self):
         """Clear the database"""
-        from PyQt6.QtWidgets import QMessageBox
-        
         reply = QMessageBox.question(
             self, 
             "Clear Database", 
@@ -414,50 +480,32 @@ class SettingsDialog(QDialog):
         
         if reply == QMessageBox.StandardButton.Yes:
             self.db_manager.clear_history(keep_pinned=False)
+            self.history_cleared.emit()
             QMessageBox.information(self, "Database Cleared", "All clipboard history has been cleared.")
     
     def apply_theme(self):
         """Apply current theme to the dialog"""
-        theme = self.theme_manager.current_theme
-        
-        self.setStyleSheet(f"""
-            QDialog {{
-                background-color: {theme.get('window_bg', '#ffffff')};
-                color: {theme.get('window_text', '#000000')};
-            }}
-            QGroupBox {{
-                font-weight: bold;
-                border: 2px solid {theme.get('border', '#e0e0e0')};
-                border-radius: 5px;
-                margin-top: 1ex;
-                padding-top: 10px;
-            }}
-            QGroupBox::title {{
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px 0 5px;
-            }}
-            QLineEdit, QComboBox, QSpinBox {{
-                background-color: {theme.get('input_bg', '#ffffff')};
-                color: {theme.get('input_text', '#000000')};
-                border: 1px solid {theme.get('input_border', '#e0e0e0')};
-                border-radius: 3px;
-                padding: 4px;
-            }}
-            QPushButton {{
-                background-color: {theme.get('button_bg', '#f0f0f0')};
-                color: {theme.get('button_text', '#000000')};
-                border: 1px solid {theme.get('button_border', '#d0d0d0')};
-                border-radius: 3px;
-                padding: 6px;
-            }}
-            QPushButton:hover {{
-                background-color: {theme.get('button_hover', '#e0e0e0')};
-            }}
-            QCheckBox {{
-                color: {theme.get('item_text', '#000000')};
-            }}
-        """)
+        # The stylesheet is rendered once per theme, so an unchanged theme
+        # yields the same string object and restyling can be skipped
+        qss = self.theme_manager.get_dialog_qss()
+        if qss is self._last_qss:
+            return
+        self._last_qss = qss
+        
+        # A hidden dialog picks the stylesheet up in showEvent instead, so
+        # styling during construction costs no extra style pass
+        if not self.isVisible():
+            self._pending_qss = qss
+            return
+        self._pending_qss = None
+        self.setStyleSheet(qss)
+    
+    def showEvent(self, event):
+        """Apply any stylesheet deferred while the dialog was hidden"""
+        if self._pending_qss is not None:
+            self.setStyleSheet(self._pending_qss)
+            self._pending_qss = None
+        super().showEvent(event)
     
     def accept(self):
         """Handle OK button click"""
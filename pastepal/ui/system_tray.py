@@ -4,8 +4,19 @@ System tray functionality for PastePal
 
 from PyQt6.QtWidgets import QSystemTrayIcon, QMenu, QApplication
 from PyQt6.QtCore import QObject, pyqtSignal
-from PyQt6.QtGui import QIcon, QPixmap, QPainter, QFont, QColor
-from typing import Optional
+from PyQt6.QtGui import QAction, QIcon, QPixmap, QPainter, QFont, QColor
+from typing import Dict, List, Optional
+import functools
+
+
+_WHITE = QColor(255, 255, 255)
+_TRANSPARENT = QColor(0, 0, 0, 0)
+
+
+@functools.lru_cache(maxsize=None)
+def _tray_font() -> QFont:
+    """Font for the tray icon letter, created once a QApplication exists"""
+    return QFont("Arial", 16, QFont.Weight.Bold)
 
 
 class SystemTrayManager(QObject):
@@ -19,6 +30,11 @@ class SystemTrayManager(QObject):
         super().__init__(parent)
         self.tray_icon = None
         self.tray_menu = None
+        # Rendered icons by status; the plain tray icon is stored under None
+        self._icon_cache: Dict[Optional[str], QIcon] = {}
+        # Caller-supplied actions currently shown, and their separator
+        self._extra_actions: List[QAction] = []
+        self._extra_actions_sep: Optional[QAction] = None
         self.setup_tray_icon()
     
     def setup_tray_icon(self):
@@ -36,22 +52,22 @@ class SystemTrayManager(QObject):
         self.tray_menu = QMenu()
         
         # Show Clipboard action
-        show_action = self.tray_menu.addAction("Show Clipboard")
-        show_action.triggered.connect(self.show_window_requested.emit)
+        self._show_action = self.tray_menu.addAction("Show Clipboard")
+        self._show_action.triggered.connect(self.show_window_requested.emit)
         
         # Separator
-        self.tray_menu.addSeparator()
+        self._sep1 = self.tray_menu.addSeparator()
         
         # Settings action
-        settings_action = self.tray_menu.addAction("Settings")
-        settings_action.triggered.connect(self.settings_requested.emit)
+        self._settings_action = self.tray_menu.addAction("Settings")
+        self._settings_action.triggered.connect(self.settings_requested.emit)
         
         # Separator
-        self.tray_menu.addSeparator()
+        self._sep2 = self.tray_menu.addSeparator()
         
         # Quit action
-        quit_action = self.tray_menu.addAction("Quit")
-        quit_action.triggered.connect(self.quit_requested.emit)
+        self._quit_action = self.tray_menu.addAction("Quit")
+        self._quit_action.triggered.connect(self.quit_requested.emit)
         
         # Set context menu
         self.tray_icon.setContextMenu(self.tray_menu)
@@ -61,29 +77,44 @@ class SystemTrayManager(QObject):
         
         # Show the tray icon
         self.tray_icon.show()
+        
+        # The tray is set up after the main window's first paint, and the
+        # status icons must be ready before the services report a status
+        self._prewarm_icons()
+    
+    def _prewarm_icons(self):
+        """Render every status icon into the cache"""
+        for status in ("default", "active", "paused", "error"):
+            self.create_status_icon(status)
     
     def create_tray_icon(self) -> QIcon:
         """Create the system tray icon"""
+        icon = self._icon_cache.get(None)
+        if icon is not None:
+            return icon
+        
         # Create a simple icon with "P" for PastePal
         pixmap = QPixmap(32, 32)
-        pixmap.fill(QColor(0, 0, 0, 0))  # Transparent background
+        pixmap.fill(_TRANSPARENT)  # Transparent background
         
         painter = QPainter(pixmap)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         
         # Draw background circle
         painter.setBrush(QColor(0, 120, 212))  # Blue background
-        painter.setPen(QColor(255, 255, 255))  # White border
+        painter.setPen(_WHITE)  # White border
         painter.drawEllipse(2, 2, 28, 28)
         
         # Draw "P" letter
-        painter.setPen(QColor(255, 255, 255))  # White text
-        painter.setFont(QFont("Arial", 16, QFont.Weight.Bold))
+        painter.setPen(_WHITE)  # White text
+        painter.setFont(_tray_font())
         painter.drawText(8, 22, "P")
         
         painter.end()
         
-        return QIcon(pixmap)
+        icon = QIcon(pixmap)
+        self._icon_cache[None] = icon
+        return icon
     
     def on_tray_activated(self, reason):
         """Handle tray icon activation"""
@@ -119,28 +150,21 @@ class SystemTrayManager(QObject):
         if not self.tray_menu:
             return
         
-        # Clear existing menu
-        self.tray_menu.clear()
-        
-        # Add standard actions
-        show_action = self.tray_menu.addAction("Show Clipboard")
-        show_action.triggered.connect(self.show_window_requested.emit)
-        
-        self.tray_menu.addSeparator()
-        
-        settings_action = self.tray_menu.addAction("Settings")
-        settings_action.triggered.connect(self.settings_requested.emit)
-        
-        # Add additional actions if provided
-        if additional_actions:
-            self.tray_menu.addSeparator()
-            for action in additional_actions:
-                self.tray_menu.addAction(action)
-        
-        self.tray_menu.addSeparator()
-        
-        quit_action = self.tray_menu.addAction("Quit")
-        quit_action.triggered.connect(self.quit_requested.emit)
+        # Only the previous extras are removed; the standard actions and
+        # their connections stay in place
+        for action in self._extra_actions:
+            self.tray_menu.removeAction(action)
+        if self._extra_actions_sep:
+            self.tray_menu.removeAction(self._extra_actions_sep)
+        self._extra_actions = list(additional_actions or [])
+        
+        # Add additional actions between Settings and Quit
+        if self._extra_actions:
+            if self._extra_actions_sep is None:
+                self._extra_actions_sep = QAction(self.tray_menu)
+                self._extra_actions_sep.setSeparator(True)
+            self.tray_menu.insertAction(self._sep2, self._extra_actions_sep)
+            self.tray_menu.insertActions(self._sep2, self._extra_actions)
     
     def set_icon(self, icon: QIcon):
         """Set a custom icon for the tray"""
@@ -149,8 +173,13 @@ class SystemTrayManager(QObject):
     
     def create_status_icon(self, status: str) -> QIcon:
         """Create an icon with status indicator"""
+        # Status icons never change, so each is painted only once
+        icon = self._icon_cache.get(status)
+        if icon is not None:
+            return icon
+        
         pixmap = QPixmap(32, 32)
-        pixmap.fill(QColor(0, 0, 0, 0))  # Transparent background
+        pixmap.fill(_TRANSPARENT)  # Transparent background
         
         painter = QPainter(pixmap)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
@@ -167,17 +196,19 @@ class SystemTrayManager(QObject):
         
         # Draw background circle
         painter.setBrush(bg_color)
-        painter.setPen(QColor(255, 255, 255))  # White border
+        painter.setPen(_WHITE)  # White border
         painter.drawEllipse(2, 2, 28, 28)
         
         # Draw "P" letter
-        painter.setPen(QColor(255, 255, 255))  # White text
-        painter.setFont(QFont("Arial", 16, QFont.Weight.Bold))
+        painter.setPen(_WHITE)  # White text
+        painter.setFont(_tray_font())
         painter.drawText(8, 22, "P")
         
         painter.end()
         
-        return QIcon(pixmap)
+        icon = QIcon(pixmap)
+        self._icon_cache[status] = icon
+        return icon
     
     def update_status(self, status: str):
         """Update the tray icon status"""
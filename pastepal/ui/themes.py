@@ -2,8 +2,86 @@
 Theme management for PastePal
 """
 
+from dataclasses import dataclass, asdict, fields
+from types import MappingProxyType
 from PyQt6.QtCore import QObject, pyqtSignal
-from typing import Dict, Any
+from typing import Dict, Any, Mapping, Optional
+
+
+@dataclass(frozen=True, slots=True)
+class Theme:
+    """Color palette for a theme"""
+    name: str = ''
+    window_bg: str = '#ffffff'
+    window_text: str = '#000000'
+    item_bg: str = '#ffffff'
+    item_text: str = '#000000'
+    selection_bg: str = '#0078d4'
+    selection_text: str = '#ffffff'
+    hover_bg: str = '#f0f0f0'
+    input_bg: str = '#ffffff'
+    input_text: str = '#000000'
+    input_border: str = '#e0e0e0'
+    button_bg: str = '#f0f0f0'
+    button_text: str = '#000000'
+    button_border: str = '#d0d0d0'
+    button_hover: str = '#e0e0e0'
+    border: str = '#e0e0e0'
+    scroll_bg: str = '#ffffff'
+    accent: str = '#0078d4'
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Theme':
+        """Create a theme from a dictionary, ignoring unknown keys"""
+        known = {field.name for field in fields(cls)}
+        return cls(**{key: value for key, value in data.items() if key in known})
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert theme to dictionary"""
+        return asdict(self)
+
+
+LIGHT = Theme(
+    name='Light Mode',
+    window_bg='#ffffff',
+    window_text='#000000',
+    item_bg='#ffffff',
+    item_text='#000000',
+    selection_bg='#0078d4',
+    selection_text='#ffffff',
+    hover_bg='#f5f5f5',
+    input_bg='#ffffff',
+    input_text='#000000',
+    input_border='#d0d0d0',
+    button_bg='#f8f8f8',
+    button_text='#000000',
+    button_border='#c0c0c0',
+    button_hover='#e8e8e8',
+    border='#d0d0d0',
+    scroll_bg='#ffffff',
+    accent='#0078d4'
+)
+
+DARK = Theme(
+    name='Dark Mode',
+    window_bg='#2d2d30',
+    window_text='#ffffff',
+    item_bg='#3c3c3c',
+    item_text='#ffffff',
+    selection_bg='#0078d4',
+    selection_text='#ffffff',
+    hover_bg='#4a4a4a',
+    input_bg='#3c3c3c',
+    input_text='#ffffff',
+    input_border='#555555',
+    button_bg='#4a4a4a',
+    button_text='#ffffff',
+    button_border='#666666',
+    button_hover='#5a5a5a',
+    border='#555555',
+    scroll_bg='#2d2d30',
+    accent='#0078d4'
+)
 
 
 class ThemeManager(QObject):
@@ -13,84 +91,109 @@ class ThemeManager(QObject):
     
     def __init__(self):
         super().__init__()
-        self.themes = {
-            'light': {
-                'name': 'Light Mode',
-                'window_bg': '#ffffff',
-                'window_text': '#000000',
-                'item_bg': '#ffffff',
-                'item_text': '#000000',
-                'selection_bg': '#0078d4',
-                'selection_text': '#ffffff',
-                'hover_bg': '#f5f5f5',
-                'input_bg': '#ffffff',
-                'input_text': '#000000',
-                'input_border': '#d0d0d0',
-                'button_bg': '#f8f8f8',
-                'button_text': '#000000',
-                'button_border': '#c0c0c0',
-                'button_hover': '#e8e8e8',
-                'border': '#d0d0d0',
-                'scroll_bg': '#ffffff',
-                'accent': '#0078d4'
-            },
-            'dark': {
-                'name': 'Dark Mode',
-                'window_bg': '#2d2d30',
-                'window_text': '#ffffff',
-                'item_bg': '#3c3c3c',
-                'item_text': '#ffffff',
-                'selection_bg': '#0078d4',
-                'selection_text': '#ffffff',
-                'hover_bg': '#4a4a4a',
-                'input_bg': '#3c3c3c',
-                'input_text': '#ffffff',
-                'input_border': '#555555',
-                'button_bg': '#4a4a4a',
-                'button_text': '#ffffff',
-                'button_border': '#666666',
-                'button_hover': '#5a5a5a',
-                'border': '#555555',
-                'scroll_bg': '#2d2d30',
-                'accent': '#0078d4'
-            }
+        self.themes: Dict[str, Theme] = {
+            'light': LIGHT,
+            'dark': DARK
         }
         self.current_theme_name = 'light'
         self.current_theme = self.themes[self.current_theme_name]
+        self._dialog_qss_cache: Dict[str, str] = {}
+        self._names_cache: Optional[Mapping[str, str]] = None
     
     def get_available_themes(self) -> list:
         """Get list of available theme names"""
         return list(self.themes.keys())
     
-    def get_theme_names(self) -> Dict[str, str]:
+    def get_theme_names(self) -> Mapping[str, str]:
         """Get theme names mapping"""
-        return {key: theme['name'] for key, theme in self.themes.items()}
+        # The cached mapping is shared, so callers get a read-only view
+        if self._names_cache is None:
+            self._names_cache = MappingProxyType({key: theme.name for key, theme in self.themes.items()})
+        return self._names_cache
     
     def set_theme(self, theme_name: str):
         """Set the current theme"""
-        if theme_name in self.themes:
-            self.current_theme_name = theme_name
-            self.current_theme = self.themes[theme_name]
-            self.theme_changed.emit()
+        theme = self.themes.get(theme_name)
+        # Reselecting the active theme would only restyle every listener
+        # for nothing; a re-imported palette under the same name still applies
+        if theme is None or theme is self.current_theme:
+            return
+        self.current_theme_name = theme_name
+        self.current_theme = theme
+        self.theme_changed.emit()
     
     def get_current_theme_name(self) -> str:
         """Get current theme name"""
         return self.current_theme_name
     
-    def get_theme(self, theme_name: str = None) -> Dict[str, Any]:
+    def get_theme(self, theme_name: str = None) -> Theme:
         """Get theme data"""
         if theme_name is None:
             return self.current_theme
         return self.themes.get(theme_name, self.current_theme)
     
+    def get_dialog_qss(self) -> str:
+        """Get the settings dialog stylesheet for the current theme"""
+        qss = self._dialog_qss_cache.get(self.current_theme_name)
+        if qss is None:
+            qss = self._render_dialog_qss(self.current_theme)
+            self._dialog_qss_cache[self.current_theme_name] = qss
+        return qss
+    
+    def _render_dialog_qss(self, theme: Theme) -> str:
+        """Render the settings dialog stylesheet for a theme"""
+        return f"""
+        QDialog {{
+            background-color: {theme.window_bg};
+            color: {theme.window_text};
+        }}
+        QGroupBox {{
+            font-weight: bold;
+            border: 2px solid {theme.border};
+            border-radius: 5px;
+            margin-top: 1ex;
+            padding-top: 10px;
+        }}
+        QGroupBox::title {{
+            subcontrol-origin: margin;
+            left: 10px;
+            padding: 0 5px 0 5px;
+        }}
+        QLineEdit, QComboBox, QSpinBox {{
+            background-color: {theme.input_bg};
+            color: {theme.input_text};
+            border: 1px solid {theme.input_border};
+            border-radius: 3px;
+            padding: 4px;
+        }}
+        QPushButton {{
+            background-color: {theme.button_bg};
+            color: {theme.button_text};
+            border: 1px solid {theme.button_border};
+            border-radius: 3px;
+            padding: 6px;
+        }}
+        QPushButton:hover {{
+            background-color: {theme.button_hover};
+        }}
+        QCheckBox {{
+            color: {theme.item_text};
+        }}
+        """
+    
     def add_custom_theme(self, name: str, theme_data: Dict[str, Any]):
         """Add a custom theme"""
-        self.themes[name] = theme_data
+        self._names_cache = None
+        self.themes[name] = Theme.from_dict(theme_data)
+        self._dialog_qss_cache.pop(name, None)
     
     def export_theme(self, theme_name: str) -> Dict[str, Any]:
         """Export theme data"""
-        return self.themes.get(theme_name, {}).copy()
+        theme = self.themes.get(theme_name)
+        return theme.to_dict() if theme else {}
     
     def import_theme(self, name: str, theme_data: Dict[str, Any]):
         """Import theme data"""
-        self.themes[name] = theme_data
+        self._names_cache = None
+        self.themes[name] = Theme.from_dict(theme_data)
+        self._dialog_qss_cache.pop(name, None)
@@ -10,9 +10,10 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 def check_pyqt6():
     """Check if PyQt6 is working"""
+    # Importing (not just locating) the module is what catches a broken
+    # install; the loaded modules stay in sys.modules for pastepal.main
     try:
-        from PyQt6.QtCore import QCoreApplication
-        from PyQt6.QtWidgets import QApplication
+        import PyQt6.QtWidgets  # noqa: F401
         return True
     except ImportError as e:
         print(f"PyQt6 import error: {e}")